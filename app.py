@@ -39,6 +39,7 @@ bronze_to_silver_wf = BronzeToSilverWorkflowStack(
         athena_results_bucket=dl_stack.athena_results_bucket,
         scripts_bucket=glue_scripts_stack.scripts_bucket,
         notification_email=env_config.email,
+        execution_mode="auto",
     ),
 )
 bronze_to_silver_wf.add_dependency(dl_stack)
@@ -49,8 +50,10 @@ silver_to_dynamo_wf = SilverToDynamoEventsWorkflowStack(
     construct_id=f"{app_config.project_name}-slv-to-dynamo-wf",
     props=SilverToDynamoEventsWorkflowStackProps(
         silver_bucket=dl_stack.silver_bucket,
+        silver_db_name=dl_stack.glue_db_name,
         scripts_bucket=glue_scripts_stack.scripts_bucket,
         notification_email=env_config.email,
+        execution_mode="auto",
     ),
 )
 silver_to_dynamo_wf.add_dependency(dl_stack)
@@ -64,6 +67,8 @@ orchestrator_stack = RssPipelineOrchestratorStack(
         bronze_bucket=dl_stack.bronze_bucket,
         bronze_to_silver_state_machine=bronze_to_silver_wf.state_machine,
         silver_to_dynamo_state_machine=silver_to_dynamo_wf.state_machine,
+        events_table=silver_to_dynamo_wf.events_table,
+        snapshots_bucket=dl_stack.snapshots_bucket,
     ),
 )
 orchestrator_stack.add_dependency(dl_stack)
@@ -75,6 +80,10 @@ api_stack = ApiStack(
     id=f"{app_config.project_name}-api",
     props=ApiStackProps(
         dynamodb_table=silver_to_dynamo_wf.events_table,
+        date_index_name=silver_to_dynamo_wf.date_index_name,
+        snapshots_bucket=dl_stack.snapshots_bucket,
+        load_marker_bucket=dl_stack.silver_bucket,
+        load_marker_key=silver_to_dynamo_wf.load_marker_key,
     ),
 )
 api_stack.add_dependency(orchestrator_stack)
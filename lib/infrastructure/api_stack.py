@@ -1,13 +1,32 @@
 from dataclasses import dataclass
 from typing import Any
 
-from aws_cdk import aws_apigateway, aws_lambda, aws_dynamodb, Stack, Duration
+from aws_cdk import (
+    aws_apigateway,
+    aws_cloudfront,
+    aws_cloudfront_origins,
+    aws_lambda,
+    aws_dynamodb,
+    aws_s3,
+    CfnOutput,
+    Stack,
+    Duration,
+    Size,
+)
+from aws_cdk.aws_s3 import IBucket
 from constructs import Construct
+from lib.pipeline.stacks.function_code import function_code
 
 
 @dataclass
 class ApiStackProps:
     dynamodb_table: aws_dynamodb.Table
+    date_index_name: str
+    # Object the pipeline rewrites after each DynamoDB load, used to invalidate caches
+    load_marker_bucket: IBucket
+    load_marker_key: str
+    # Written by the orchestrator's snapshot stage, served under /snapshots/*
+    snapshots_bucket: IBucket
 
 
 class ApiStack(Stack):
@@ -25,23 +44,91 @@ class ApiStack(Stack):
             id="UCEventsAPIHandler",
             runtime=aws_lambda.Runtime.PYTHON_3_14,
             handler="api_get_event_names.lambda_handler",
-            code=aws_lambda.Code.from_asset("lib/pipeline/functions"),
+            code=function_code("api_get_event_names"),
             timeout=Duration.seconds(30),
             environment={
                 "TABLE_NAME": props.dynamodb_table.table_name,
+                "MARKER_BUCKET_NAME": props.load_marker_bucket.bucket_name,
+                "MARKER_KEY": props.load_marker_key,
+                "CACHE_TTL_SECONDS": "300",
             },
         )
 
         props.dynamodb_table.grant_read_data(handler)
+        props.load_marker_bucket.grant_read(handler, props.load_marker_key)
 
         api = aws_apigateway.RestApi(
             scope=self,
             id="UCEventsAPI",
             rest_api_name="UC Events Service",
             description="This service serves as the API Gateway for the UC Events Service.",
+            # Gzip or deflate responses above 1 KiB when Accept-Encoding allows it
+            min_compression_size=Size.kibibytes(1),
         )
 
         events = api.root.add_resource("events")
         events.add_method(
             "GET", aws_apigateway.LambdaIntegration(handler)
         )  # GET /events
+
+        events_by_date_handler = aws_lambda.Function(
+            scope=self,
+            id="UCEventsByDateAPIHandler",
+            runtime=aws_lambda.Runtime.PYTHON_3_14,
+            handler="api_get_events_by_date.lambda_handler",
+            code=function_code("api_get_events_by_date"),
+            timeout=Duration.seconds(30),
+            environment={
+                "TABLE_NAME": props.dynamodb_table.table_name,
+                "DATE_INDEX_NAME": props.date_index_name,
+            },
+        )
+
+        props.dynamodb_table.grant_read_data(events_by_date_handler)
+
+        events_range = events.add_resource("range")
+        events_range.add_method(
+            "GET",
+            aws_apigateway.LambdaIntegration(events_by_date_handler),
+            request_parameters={
+                "method.request.querystring.from": True,
+                "method.request.querystring.to": False,
+                "method.request.querystring.limit": False,
+                "method.request.querystring.cursor": False,
+            },
+        )  # GET /events/range?from=&to=&limit=&cursor=
+
+        # The API stays the default origin. Snapshot requests are answered by
+        # CloudFront from S3 and never reach Lambda or DynamoDB.
+        distribution = aws_cloudfront.Distribution(
+            scope=self,
+            id="UCEventsDistribution",
+            comment="UC Events API and event snapshots",
+            default_behavior=aws_cloudfront.BehaviorOptions(
+                origin=aws_cloudfront_origins.RestApiOrigin(api),
+                viewer_protocol_policy=aws_cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+                cache_policy=aws_cloudfront.CachePolicy.CACHING_DISABLED,
+                origin_request_policy=aws_cloudfront.OriginRequestPolicy.ALL_VIEWER_EXCEPT_HOST_HEADER,
+            ),
+            additional_behaviors={
+                "/snapshots/*": aws_cloudfront.BehaviorOptions(
+                    # Imported by name so CloudFront does not edit the bucket
+                    # policy, which DataLakeStack owns
+                    origin=aws_cloudfront_origins.S3BucketOrigin.with_origin_access_control(
+                        aws_s3.Bucket.from_bucket_name(
+                            self, "SnapshotsBucket", props.snapshots_bucket.bucket_name
+                        )
+                    ),
+                    viewer_protocol_policy=aws_cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+                    cache_policy=aws_cloudfront.CachePolicy.CACHING_OPTIMIZED,
+                    # Snapshots are stored gzip-compressed already
+                    compress=False,
+                ),
+            },
+        )
+
+        CfnOutput(
+            scope=self,
+            id="UCEventsDistributionDomainName",
+            value=distribution.distribution_domain_name,
+        )
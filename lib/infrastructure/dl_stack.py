@@ -3,7 +3,7 @@ Data lake infrastructure with Lake Formation governance.
 Manages bronze and silver S3 buckets following medallion architecture.
 """
 
-from aws_cdk import Aws, Duration, RemovalPolicy, Stack, aws_glue, aws_s3
+from aws_cdk import Aws, Duration, RemovalPolicy, Stack, aws_glue, aws_iam, aws_s3
 from aws_cdk import aws_athena as athena
 from constructs import Construct
 
@@ -16,6 +16,7 @@ class DataLakeStack(Stack):
 
     bronze_bucket: aws_s3.Bucket
     silver_bucket: aws_s3.Bucket
+    snapshots_bucket: aws_s3.Bucket
     athena_results_bucket: aws_s3.Bucket
     glue_db_name: str
 
@@ -44,6 +45,8 @@ class DataLakeStack(Stack):
             ],
             # Delete after 90 days from creation
             expiration=Duration.days(90),
+            # Clean up parts left behind by an interrupted streaming upload
+            abort_incomplete_multipart_upload_after=Duration.days(1),
         )
 
         self.bronze_bucket = aws_s3.Bucket(
@@ -54,12 +57,47 @@ class DataLakeStack(Stack):
             lifecycle_rules=[life_cycle_rule],
         )
 
+        # Silver holds the uc_events Iceberg table. Its data files stay live for
+        # as long as a snapshot references them, so they must not be archived or
+        # expired by age. The Glue job expires old snapshots instead.
         self.silver_bucket = aws_s3.Bucket(
             scope=self,
             id="SilverBucket",
             bucket_name=f"{construct_id}-silver-bucket",
             removal_policy=RemovalPolicy.DESTROY,
-            lifecycle_rules=[life_cycle_rule],
+            lifecycle_rules=[
+                aws_s3.LifecycleRule(
+                    id=f"{construct_id}-silver-lifecycle-rule",
+                    abort_incomplete_multipart_upload_after=Duration.days(1),
+                ),
+                # Per run changesets written by the bronze to silver job
+                aws_s3.LifecycleRule(
+                    id=f"{construct_id}-silver-changes-lifecycle-rule",
+                    prefix="_changes/",
+                    expiration=Duration.days(30),
+                ),
+            ],
+        )
+
+        # Static JSON snapshots of the events table, served through CloudFront.
+        # Only CloudFront reads them, so the bucket stays private.
+        self.snapshots_bucket = aws_s3.Bucket(
+            scope=self,
+            id="SnapshotsBucket",
+            bucket_name=f"{construct_id}-snapshots-bucket",
+            removal_policy=RemovalPolicy.DESTROY,
+            block_public_access=aws_s3.BlockPublicAccess.BLOCK_ALL,
+            enforce_ssl=True,
+        )
+        # Granted here rather than by the distribution, since a policy naming the
+        # distribution would make this stack depend on the API stack
+        self.snapshots_bucket.add_to_resource_policy(
+            aws_iam.PolicyStatement(
+                actions=["s3:GetObject"],
+                resources=[self.snapshots_bucket.arn_for_objects("snapshots/*")],
+                principals=[aws_iam.ServicePrincipal("cloudfront.amazonaws.com")],
+                conditions={"StringEquals": {"AWS:SourceAccount": Aws.ACCOUNT_ID}},
+            )
         )
 
         self.athena_results_bucket = aws_s3.Bucket(
@@ -0,0 +1,297 @@
+"""
+Lambda counterpart of the bronze_to_silver Glue job for small loads.
+
+Runs the same transform as ```uc_local``` over the given bronze keys and
+replaces the content of the silver Iceberg table with the result through
+pyiceberg. Since only the events of the newest file stay active, the result
+holds the same events and content as the Glue job's MERGE would. Unlike the
+MERGE, which leaves unchanged rows alone, the overwrite gives every row this
+run's record_source and load_date.
+
+The changeset under ```_changes/``` is written through ```uc_changes```, the
+same way the Glue job writes it. Snapshots are expired after every load like the Glue job does.
+pyiceberg cannot delete the files they leave behind nor compact, so the
+bronze_to_silver job runs weekly with ```--MAINTENANCE_ONLY``` for that.
+"""
+
+import io
+import logging
+import os
+from contextlib import closing
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+import boto3
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pyiceberg.catalog import load_catalog
+from pyiceberg.exceptions import NoSuchTableError
+from pyiceberg.table import Table
+from pyiceberg.transforms import IdentityTransform, MonthTransform
+
+from uc_changes import (
+    changeset_base_snapshot_id,
+    changeset_key,
+    changeset_run_id,
+    copy_to_processed_bucket,
+    write_latest_changeset,
+)
+from uc_local import transform
+from uc_spark import (
+    SILVER_EVENTS_TABLE,
+    SNAPSHOT_MAX_AGE_DAYS,
+    SNAPSHOT_RETAIN_LAST,
+    drop_legacy_silver_table,
+)
+from uc_transform import open_bronze, sort_source_keys
+from uc_types import EVENT_FIELDS
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+s3_client = boto3.client("s3")
+glue_client = boto3.client("glue")
+
+
+def load_silver_table(database_name: str) -> Optional[Table]:
+    """
+    Loads the silver table, None when it does not exist yet or was still the
+    table the S3 crawler registered, which is dropped.
+    """
+
+    if drop_legacy_silver_table(glue_client, database_name):
+        logger.info(f"Dropped the non-Iceberg {database_name}.{SILVER_EVENTS_TABLE}")
+
+    try:
+        return load_catalog("glue", type="glue").load_table(
+            (database_name, SILVER_EVENTS_TABLE)
+        )
+    except NoSuchTableError:
+        return None
+
+
+def create_silver_table(database_name: str, location: str, schema: pa.Schema) -> Table:
+    """
+    Creates the silver table with the Glue job's layout.
+    """
+
+    logger.info(f"Creating {database_name}.{SILVER_EVENTS_TABLE}")
+    table = load_catalog("glue", type="glue").create_table(
+        (database_name, SILVER_EVENTS_TABLE),
+        schema=schema,
+        location=location,
+        properties={
+            "format-version": "2",
+            "write.merge.mode": "copy-on-write",
+            "write.distribution-mode": "hash",
+        },
+    )
+    with table.update_spec() as update:
+        update.add_field("start_date", MonthTransform(), "start_month")
+    with table.update_sort_order() as update:
+        update.asc("start_date", IdentityTransform())
+        update.asc("start_time", IdentityTransform())
+    return table
+
+
+def silver_rows(table: Optional[Table]) -> Optional[pa.Table]:
+    """
+    Returns the event fields and item fingerprints of the current silver
+    rows, None while there are no fingerprints to look up.
+    """
+
+    if table is None or "item_fingerprint" not in table.schema().column_names:
+        return None
+    return table.scan(selected_fields=(*EVENT_FIELDS, "item_fingerprint")).to_arrow()
+
+
+def ensure_fingerprint_column(table: Table, schema: pa.Schema) -> None:
+    """
+    Adds the item_fingerprint column to tables created before it existed,
+    which pyiceberg requires before writing it.
+    """
+
+    if "item_fingerprint" in table.schema().column_names:
+        return
+
+    logger.info(f"Adding item_fingerprint to {SILVER_EVENTS_TABLE}")
+    with table.update_schema() as update:
+        update.union_by_name(schema)
+
+
+def current_snapshot_id(table: Table) -> Optional[int]:
+    snapshot = table.current_snapshot()
+    return snapshot.snapshot_id if snapshot else None
+
+
+def expire_snapshots(table: Table) -> None:
+    """
+    Expires the snapshots older than ```SNAPSHOT_MAX_AGE_DAYS``` except the
+    newest ```SNAPSHOT_RETAIN_LAST```, the same policy as the Glue job's
+    ```expire_snapshots``` call. Only the metadata is updated, the data files
+    are removed by the Glue job's ```remove_orphan_files```.
+    """
+
+    older_than = datetime.now(timezone.utc) - timedelta(days=SNAPSHOT_MAX_AGE_DAYS)
+    snapshots = sorted(table.snapshots(), key=lambda snapshot: snapshot.timestamp_ms)
+    expired_ids = [
+        snapshot.snapshot_id
+        for snapshot in snapshots[:-SNAPSHOT_RETAIN_LAST]
+        if snapshot.timestamp_ms < older_than.timestamp() * 1000
+    ]
+    if not expired_ids:
+        return
+
+    table.maintenance.expire_snapshots().by_ids(expired_ids).commit()
+    logger.info(f"Expired {len(expired_ids)} snapshot(s) of {SILVER_EVENTS_TABLE}")
+
+
+def version_hashes(table: Table, snapshot_id: Optional[int]) -> pa.Table:
+    """
+    Returns event_id and content_hash of the table as of ```snapshot_id```,
+    no rows for None.
+    """
+
+    if snapshot_id is None:
+        return pa.table(
+            {
+                "event_id": pa.array([], type=pa.int32()),
+                "content_hash": pa.array([], type=pa.string()),
+            }
+        )
+    return table.scan(
+        snapshot_id=snapshot_id, selected_fields=("event_id", "content_hash")
+    ).to_arrow()
+
+
+def changes_between(previous: pa.Table, current: pa.Table) -> pa.Table:
+    """
+    Returns event_id, change_type and content_hash (null for deletes) of the
+    events inserted, updated or deleted between the two versions.
+    """
+
+    previous_hashes = dict(
+        zip(
+            previous.column("event_id").to_pylist(),
+            previous.column("content_hash").to_pylist(),
+        )
+    )
+    current_hashes = dict(
+        zip(
+            current.column("event_id").to_pylist(),
+            current.column("content_hash").to_pylist(),
+        )
+    )
+
+    rows = []
+    for event_id, content_hash in current_hashes.items():
+        if event_id not in previous_hashes:
+            rows.append((event_id, "insert", content_hash))
+        elif previous_hashes[event_id] != content_hash:
+            rows.append((event_id, "update", content_hash))
+    for event_id in previous_hashes.keys() - current_hashes.keys():
+        rows.append((event_id, "delete", None))
+
+    event_ids, change_types, content_hashes = zip(*rows) if rows else ([], [], [])
+    return pa.table(
+        {
+            "event_id": pa.array(event_ids, type=pa.int32()),
+            "change_type": pa.array(change_types, type=pa.string()),
+            "content_hash": pa.array(content_hashes, type=pa.string()),
+        }
+    )
+
+
+def write_changeset(
+    bucket_name: str,
+    changes: pa.Table,
+    previous_snapshot_id: Optional[int],
+    snapshot_id: Optional[int],
+    job_run_id: Optional[str],
+) -> Dict[str, int]:
+    run_id = changeset_run_id(job_run_id)
+
+    buffer = io.BytesIO()
+    pq.write_table(changes, buffer)
+    s3_client.put_object(
+        Bucket=bucket_name,
+        Key=f"{changeset_key(run_id)}changes.parquet",
+        Body=buffer.getvalue(),
+    )
+
+    counts = {"insert": 0, "update": 0, "delete": 0}
+    for change_type in changes.column("change_type").to_pylist():
+        counts[change_type] += 1
+
+    write_latest_changeset(
+        s3_client, bucket_name, run_id, previous_snapshot_id, snapshot_id, counts
+    )
+    return counts
+
+
+def open_bronze_objects(
+    bucket_name: str, source_keys: List[str]
+) -> Iterator[Tuple[str, BinaryIO]]:
+    """
+    Yields ```(file name, feed stream)``` for each key. Objects are streamed
+    from S3 one at a time, so neither the compressed nor the decompressed feed
+    is ever held in memory.
+    """
+
+    for source_key in source_keys:
+        obj = s3_client.get_object(Bucket=bucket_name, Key=source_key)
+        with closing(obj["Body"]) as body:
+            yield source_key.split("/")[-1], open_bronze(body)
+
+
+def handler(event, context):
+    source_bucket_name = os.environ["SOURCE_BUCKET_NAME"]
+    target_bucket_name = os.environ["TARGET_BUCKET_NAME"]
+    database_name = os.environ["SILVER_DATABASE_NAME"]
+
+    source_keys: List[str] = sort_source_keys(event.get("keys") or [])
+    if not source_keys:
+        logger.info("No source keys given, nothing to process.")
+        return {"source_keys": 0}
+
+    table = load_silver_table(database_name)
+    events = transform(
+        open_bronze_objects(source_bucket_name, source_keys),
+        silver=silver_rows(table),
+    )
+
+    if table is None:
+        table = create_silver_table(
+            database_name, f"s3://{target_bucket_name}/uc_events/", events.schema
+        )
+    ensure_fingerprint_column(table, events.schema)
+    overwrite_base_snapshot_id = current_snapshot_id(table)
+
+    table.overwrite(events)
+    logger.info(f"Wrote {events.num_rows} events to {database_name}.uc_events")
+
+    previous_snapshot_id = changeset_base_snapshot_id(
+        s3_client,
+        target_bucket_name,
+        lambda snapshot_id: table.snapshot_by_id(snapshot_id) is not None,
+        overwrite_base_snapshot_id,
+    )
+
+    counts = write_changeset(
+        target_bucket_name,
+        changes_between(version_hashes(table, previous_snapshot_id), events),
+        previous_snapshot_id,
+        current_snapshot_id(table),
+        getattr(context, "aws_request_id", None),
+    )
+
+    expire_snapshots(table)
+
+    for source_key in source_keys:
+        copy_to_processed_bucket(s3_client, source_bucket_name, source_key)
+
+    return {
+        "source_keys": len(source_keys),
+        "events": events.num_rows,
+        "changes": counts,
+    }
@@ -0,0 +1,109 @@
+"""
+Lambda counterpart of the silver_to_dynamo_events Glue job.
+
+Reads the silver Iceberg table through pyiceberg, compares its content hashes
+with the ones stored in DynamoDB and only writes new and changed events and
+deletes removed ones, like the Glue job's diff sync.
+"""
+
+import logging
+import os
+from datetime import date
+from typing import Any, Dict
+
+import boto3
+from pyiceberg.catalog import load_catalog
+
+from uc_dynamo import batch_write, write_load_marker
+from uc_spark import SILVER_EVENTS_TABLE
+
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+dynamodb_client = boto3.client("dynamodb")
+s3_client = boto3.client("s3")
+
+
+def to_attribute_value(value: Any) -> Dict[str, str]:
+    if isinstance(value, bool):
+        return {"BOOL": value}
+    if isinstance(value, int):
+        return {"N": str(value)}
+    if isinstance(value, date):
+        return {"S": value.isoformat()}
+    return {"S": str(value)}
+
+
+def to_item(row: Dict[str, Any]) -> Dict[str, Dict[str, str]]:
+    # Null attributes are left out, DynamoDB keys can't be null
+    return {
+        name: to_attribute_value(value)
+        for name, value in row.items()
+        if value is not None
+    }
+
+
+def dynamodb_content_hashes(table_name: str) -> Dict[int, Any]:
+    paginator = dynamodb_client.get_paginator("scan")
+    hashes = {}
+    for page in paginator.paginate(
+        TableName=table_name, ProjectionExpression="event_id, content_hash"
+    ):
+        for item in page["Items"]:
+            content_hash = item.get("content_hash", {}).get("S")
+            hashes[int(item["event_id"]["N"])] = content_hash
+    return hashes
+
+
+def handler(event, context):
+    table_name = os.environ["DYNAMO_TABLE"]
+    sync_mode = os.environ.get("SYNC_MODE", "diff")
+
+    silver = (
+        load_catalog("glue", type="glue")
+        .load_table((os.environ["SILVER_DATABASE_NAME"], SILVER_EVENTS_TABLE))
+        .scan()
+        .to_arrow()
+        .to_pylist()
+    )
+    dynamodb_hashes = dynamodb_content_hashes(table_name)
+
+    counts = {"insert": 0, "update": 0, "delete": 0, "unchanged": 0}
+    upserts = []
+    silver_ids = set()
+    for row in silver:
+        # The item fingerprint only drives bronze to silver, it stays out of DynamoDB
+        row.pop("item_fingerprint", None)
+        silver_ids.add(row["event_id"])
+        if row["event_id"] not in dynamodb_hashes:
+            counts["insert"] += 1
+        elif dynamodb_hashes[row["event_id"]] != row["content_hash"]:
+            counts["update"] += 1
+        else:
+            counts["unchanged"] += 1
+            if sync_mode != "full":
+                continue
+        upserts.append({"PutRequest": {"Item": to_item(row)}})
+
+    removed_ids = dynamodb_hashes.keys() - silver_ids
+    counts["delete"] = len(removed_ids)
+    logger.info(f"Sync mode '{sync_mode}', actions: {counts}")
+
+    batch_write(
+        dynamodb_client,
+        table_name,
+        (
+            {"DeleteRequest": {"Key": {"event_id": {"N": str(event_id)}}}}
+            for event_id in removed_ids
+        ),
+    )
+    batch_write(dynamodb_client, table_name, upserts)
+
+    write_load_marker(
+        s3_client,
+        os.environ["SILVER_BUCKET_NAME"],
+        os.environ["LOAD_MARKER_KEY"],
+        sync_mode,
+        counts,
+    )
+    return counts
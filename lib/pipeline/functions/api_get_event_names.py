@@ -1,21 +1,121 @@
 """
 This module contains the Lambda function that retrieves event names from the DynamoDB table. It is used by the API Gateway to provide a list of event names to the frontend application.
+
+The title list only changes when the pipeline loads DynamoDB, so it is cached
+in memory and keyed on the ETag of the load marker the Glue job writes. Within
+```CACHE_TTL_SECONDS``` a warm container answers from the cache without any
+AWS call, after that a HeadObject on the marker decides whether to rescan.
+
+Responses carry an ETag over the body and ```Cache-Control```, and requests
+whose ```If-None-Match``` matches get an empty 304. Compression of large
+bodies is left to API Gateway, see ```ApiStack```.
 """
 
+import hashlib
 import os
 import json
-import boto3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from aws_clients import client
+
+_cache: Dict[str, Any] = {"marker": None, "checked_at": 0.0, "body": None, "etag": None}
+
+
+def load_marker_etag() -> Optional[str]:
+    """
+    Returns the ETag of the last load marker, or None before the first load.
+    """
+
+    s3_client = client("s3")
+    try:
+        response = s3_client.head_object(
+            Bucket=os.environ["MARKER_BUCKET_NAME"], Key=os.environ["MARKER_KEY"]
+        )
+    except s3_client.exceptions.ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey"):
+            return None
+        raise
+    return response["ETag"]
+
+
+def scan_event_names() -> List[str]:
+    """
+    Reads every title in the table. Only the title attribute is projected and
+    the scan is paginated past the 1 MB page limit.
+    """
+
+    paginator = client("dynamodb").get_paginator("scan")
+    event_names = []
+    for page in paginator.paginate(
+        TableName=os.environ["TABLE_NAME"],
+        ProjectionExpression="#title",
+        ExpressionAttributeNames={"#title": "title"},
+    ):
+        event_names.extend(item["title"]["S"] for item in page["Items"])
+    return event_names
+
+
+def get_event_names() -> Tuple[str, str]:
+    """
+    Returns the JSON body of the title list and its ETag.
+    """
+
+    now = time.monotonic()
+    ttl = float(os.environ.get("CACHE_TTL_SECONDS", "300"))
+    if _cache["body"] is not None and now - _cache["checked_at"] < ttl:
+        return _cache["body"], _cache["etag"]
+
+    marker = load_marker_etag()
+    # Without a marker there is nothing to key on, so always rescan
+    if _cache["body"] is None or marker is None or marker != _cache["marker"]:
+        body = json.dumps(scan_event_names())
+        _cache["body"] = body
+        # Strong ETag over the body, so it only changes when the titles do
+        _cache["etag"] = f'"{hashlib.sha256(body.encode("utf-8")).hexdigest()[:32]}"'
+        _cache["marker"] = marker
+    _cache["checked_at"] = now
+    return _cache["body"], _cache["etag"]
+
+
+def request_header(event, name: str) -> Optional[str]:
+    # API Gateway keeps the header names as the client sent them
+    for header, value in (event.get("headers") or {}).items():
+        if header.lower() == name:
+            return value
+    return None
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return etag in [candidate.removeprefix("W/") for candidate in candidates]
 
 
 def lambda_handler(event, context):
-    dynamodb = boto3.resource("dynamodb")
-    table = dynamodb.Table(os.environ["TABLE_NAME"])
-    response = table.scan()
-    event_names = [item["title"] for item in response["Items"]]
+    body, etag = get_event_names()
+
+    headers = {
+        "Content-Type": "application/json",
+        "ETag": etag,
+        "Cache-Control": os.environ.get("CACHE_CONTROL", "public, max-age=300"),
+    }
+
+    if etag_matches(request_header(event, "if-none-match"), etag):
+        return {
+            "isBase64Encoded": False,
+            "statusCode": 304,
+            "headers": headers,
+            "body": "",
+        }
 
     return {
         "isBase64Encoded": False,
         "statusCode": 200,
-        "headers": None,
-        "body": json.dumps(event_names),
+        "headers": headers,
+        "body": body,
     }
@@ -0,0 +1,185 @@
+"""
+This module contains the Lambda function that returns the events taking place in a date range.
+
+Events are read from the ```DateIndex``` GSI (```start_date``` / ```start_time```)
+with one Query per date, run in parallel, instead of scanning the table. Results
+come back ordered by start date and time, one page of ```limit``` events at a
+time, with an opaque ```cursor``` to fetch the next page.
+"""
+
+import base64
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from aws_clients import client, deserialize_item, to_json_value
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+# Longest range one request may cover, which bounds the Query fan-out
+MAX_RANGE_DAYS = 31
+# Dates queried at once
+MAX_PARALLEL_QUERIES = 8
+
+# Attributes that make up a DateIndex key, needed to resume inside a date
+INDEX_KEY_ATTRIBUTES = ("event_id", "start_date", "start_time")
+
+
+class BadRequest(Exception):
+    pass
+
+
+def parse_date(value: Optional[str], name: str) -> date:
+    if not value:
+        raise BadRequest(f"'{name}' is required, as YYYY-MM-DD")
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise BadRequest(f"'{name}' must be a date as YYYY-MM-DD")
+
+
+def encode_cursor(start_date: date, start_key: Optional[Dict[str, Any]]) -> str:
+    payload = json.dumps({"d": start_date.isoformat(), "k": start_key})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def is_start_key(start_date: date, start_key: Any) -> bool:
+    """
+    Whether ```start_key``` is a DateIndex key on ```start_date```, as
+    ```events_page``` writes them. Anything else would reach DynamoDB as the
+    ExclusiveStartKey and fail there.
+    """
+
+    if not isinstance(start_key, dict) or set(start_key) != set(INDEX_KEY_ATTRIBUTES):
+        return False
+    for value in start_key.values():
+        if not isinstance(value, dict) or len(value) != 1:
+            return False
+        ((type_name, raw),) = value.items()
+        if type_name not in ("S", "N") or not isinstance(raw, str):
+            return False
+    return start_key["start_date"] == {"S": start_date.isoformat()}
+
+
+def decode_cursor(cursor: str) -> Tuple[date, Optional[Dict[str, Any]]]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        start_date, start_key = date.fromisoformat(payload["d"]), payload["k"]
+    except (ValueError, KeyError, TypeError):
+        raise BadRequest("'cursor' is not valid")
+    if start_key is not None and not is_start_key(start_date, start_key):
+        raise BadRequest("'cursor' is not valid")
+    return start_date, start_key
+
+
+def query_date(
+    day: date, start_key: Optional[Dict[str, Any]], limit: int
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Returns up to ```limit``` raw items starting on ```day``` in start time
+    order, and whether the date has more items after them.
+    """
+
+    query_args = {
+        "TableName": os.environ["TABLE_NAME"],
+        "IndexName": os.environ["DATE_INDEX_NAME"],
+        "KeyConditionExpression": "start_date = :day",
+        "ExpressionAttributeValues": {":day": {"S": day.isoformat()}},
+    }
+    items: List[Dict[str, Any]] = []
+    while True:
+        if start_key:
+            query_args["ExclusiveStartKey"] = start_key
+        response = client("dynamodb").query(Limit=limit - len(items), **query_args)
+        items.extend(response["Items"])
+        start_key = response.get("LastEvaluatedKey")
+        if not start_key or len(items) >= limit:
+            return items, bool(start_key)
+
+
+def events_page(
+    from_date: date,
+    to_date: date,
+    start_key: Optional[Dict[str, Any]],
+    limit: int,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Collects the next ```limit``` raw items from ```from_date``` onwards,
+    querying up to ```MAX_PARALLEL_QUERIES``` dates at a time, and returns them
+    with the cursor of the following page.
+    """
+
+    days = [
+        from_date + timedelta(days=offset)
+        for offset in range((to_date - from_date).days + 1)
+    ]
+    items: List[Dict[str, Any]] = []
+
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_QUERIES) as executor:
+        for wave_start in range(0, len(days), MAX_PARALLEL_QUERIES):
+            wave = days[wave_start : wave_start + MAX_PARALLEL_QUERIES]
+            remaining = limit - len(items)
+            results = executor.map(
+                lambda day, wave_limit=remaining: query_date(
+                    day, start_key if day == from_date else None, wave_limit
+                ),
+                wave,
+            )
+
+            # Dates are consumed in order, so the page stays sorted by date and time
+            for day, (day_items, has_more) in zip(wave, results):
+                remaining = limit - len(items)
+                items.extend(day_items[:remaining])
+                if len(items) < limit:
+                    continue
+
+                if len(day_items) > remaining or has_more:
+                    last_key = {name: items[-1][name] for name in INDEX_KEY_ATTRIBUTES}
+                    return items, encode_cursor(day, last_key)
+                if day < to_date:
+                    return items, encode_cursor(day + timedelta(days=1), None)
+                return items, None
+
+    return items, None
+
+
+def response(status_code: int, body: Any) -> Dict[str, Any]:
+    return {
+        "isBase64Encoded": False,
+        "statusCode": status_code,
+        "headers": {"Content-Type": "application/json"},
+        "body": json.dumps(body, default=to_json_value),
+    }
+
+
+def lambda_handler(event, context):
+    params = event.get("queryStringParameters") or {}
+
+    try:
+        requested_from = parse_date(params.get("from"), "from")
+        to_date = parse_date(params.get("to") or params["from"], "to")
+        if to_date < requested_from:
+            raise BadRequest("'to' must not be before 'from'")
+        if (to_date - requested_from).days >= MAX_RANGE_DAYS:
+            raise BadRequest(f"The range must not exceed {MAX_RANGE_DAYS} days")
+
+        try:
+            limit = int(params.get("limit") or DEFAULT_LIMIT)
+        except ValueError:
+            raise BadRequest("'limit' must be a number")
+        limit = max(1, min(limit, MAX_LIMIT))
+
+        from_date, start_key = requested_from, None
+        if params.get("cursor"):
+            from_date, start_key = decode_cursor(params["cursor"])
+            # Keeps the dates queried inside the range checked above
+            if not requested_from <= from_date <= to_date:
+                raise BadRequest("'cursor' is outside the requested range")
+    except BadRequest as e:
+        return response(400, {"error": str(e)})
+
+    items, cursor = events_page(from_date, to_date, start_key, limit)
+    events = [deserialize_item(item) for item in items]
+    return response(200, {"events": events, "cursor": cursor})
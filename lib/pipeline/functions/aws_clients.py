@@ -0,0 +1,43 @@
+"""
+boto3 clients and DynamoDB item helpers shared by the Lambda handlers.
+
+boto3 is imported the first time a client is needed instead of when the handler
+module loads, so importing a handler stays cheap. Each client is created once
+and reused by every invocation of a warm container.
+"""
+
+from decimal import Decimal
+from typing import Any, Dict
+
+_clients: Dict[str, Any] = {}
+
+
+def client(service_name: str) -> Any:
+    if service_name not in _clients:
+        import boto3
+
+        _clients[service_name] = boto3.client(service_name)
+    return _clients[service_name]
+
+
+def deserialize_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turns a low-level DynamoDB item into plain Python values. Numbers come back
+    as Decimal, see ```to_json_value```.
+    """
+
+    # Only called on items a client returned, so boto3 is loaded by now
+    from boto3.dynamodb.types import TypeDeserializer
+
+    deserializer = TypeDeserializer()
+    return {name: deserializer.deserialize(value) for name, value in item.items()}
+
+
+def to_json_value(value: Any) -> Any:
+    """
+    ```json.dumps``` default for the Decimals of deserialized items.
+    """
+
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
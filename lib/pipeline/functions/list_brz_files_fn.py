@@ -1,12 +1,74 @@
 """
-Function list and return all files ending with .xml in the bronze bucket but are not in the /processed/ folder and return the list to the state machine map.
+Function list and return all files ending with .xml (or .xml.gz) in the bronze bucket but are not in the /processed/ folder and return the list to the bronze to silver Glue job.
+
+Keys are returned oldest first, ordered by the timestamp embedded in their name.
+When there are more than ```MAX_INLINE_KEYS``` files the list is written to a
+manifest object instead, so the state payload stays under the Step Functions 256 KB limit.
 """
 
-import boto3
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import List
+
+from aws_clients import client
+
+# events_20251210_063602.xml or events_20251210_063602.xml.gz. Same pattern as
+# uc_transform.source_key_timestamp_pattern, which the bundle can't import;
+# test_list_brz_files_fn checks they agree.
+BRONZE_KEY_TIMESTAMP = re.compile(r"events_(\d{8}_\d{6})\.xml(?:\.gz)?$")
+
+MANIFEST_PREFIX = "manifests/"
+
+
+def key_timestamp(key: str) -> str:
+    """
+    Returns the sortable timestamp embedded in a bronze key, or an empty string
+    so keys without one sort first.
+    """
+
+    match = BRONZE_KEY_TIMESTAMP.search(key)
+    return match.group(1) if match else ""
+
+
+def write_manifest(s3, bucket_name: str, keys: List[str]) -> str:
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    manifest_key = f"{MANIFEST_PREFIX}bronze_{timestamp}.json"
+    s3.put_object(
+        Bucket=bucket_name,
+        Key=manifest_key,
+        Body=json.dumps(keys).encode("utf-8"),
+        ContentType="application/json",
+    )
+    return manifest_key
 
 
 def handler(event, context):
-    s3 = boto3.client("s3")
-    response = s3.list_objects_v2(Bucket=event["BRONZE_BUCKET"], Prefix="new/")
-    files = [obj["Key"] for obj in response["Contents"] if obj["Key"].endswith(".xml")]
-    return files
+    s3 = client("s3")
+    bucket_name = event["BRONZE_BUCKET"]
+    max_inline_keys = int(os.environ.get("MAX_INLINE_KEYS", "500"))
+
+    files = []
+    total_bytes = 0
+    paginator = s3.get_paginator("list_objects_v2")
+    for page in paginator.paginate(Bucket=bucket_name, Prefix="new/"):
+        # "Contents" is missing from the page when the prefix is empty
+        for obj in page.get("Contents", []):
+            if obj["Key"].endswith((".xml", ".xml.gz")):
+                files.append(obj["Key"])
+                total_bytes += obj["Size"]
+
+    files.sort(key=lambda key: (key_timestamp(key), key))
+
+    manifest_key = None
+    if len(files) > max_inline_keys:
+        manifest_key = write_manifest(s3, bucket_name, files)
+        print(f"Wrote {len(files)} keys to s3://{bucket_name}/{manifest_key}")
+
+    return {
+        "count": len(files),
+        "total_bytes": total_bytes,
+        "keys": [] if manifest_key else files,
+        "manifest_key": manifest_key,
+    }
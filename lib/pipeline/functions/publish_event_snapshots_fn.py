@@ -0,0 +1,148 @@
+"""
+Lambda function that publishes static JSON snapshots of the events table to S3, served by CloudFront.
+
+Runs after the table is loaded and writes, under ```SNAPSHOT_PREFIX```:
+
+- ```events.json```: every event without its description, ordered by start date and time
+- ```days/<YYYY-MM-DD>.json```: the full events starting on that date, in the same order
+- ```events/<event_id>.json```: the full event
+
+Objects are gzip-compressed with a fixed header, so the same content always
+gives the same bytes and the same MD5 ETag. Objects whose ETag already matches
+are not rewritten, and snapshots of events or days that are gone are deleted.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from aws_clients import client, deserialize_item, to_json_value
+
+# Attributes left out of the list snapshot, fetched from the detail snapshot instead
+DETAIL_ONLY_ATTRIBUTES = ("event_description",)
+
+# S3 accepts at most 1000 keys per DeleteObjects call
+DELETE_BATCH_SIZE = 1000
+
+
+def scan_events(table_name: str) -> List[Dict[str, Any]]:
+    paginator = client("dynamodb").get_paginator("scan")
+    events = []
+    for page in paginator.paginate(TableName=table_name):
+        for item in page["Items"]:
+            event = deserialize_item(item)
+            event.pop("content_hash", None)
+            events.append(event)
+
+    # Events without a date sort last
+    events.sort(
+        key=lambda event: (
+            event.get("start_date") or "9999-12-31",
+            event.get("start_time") or "",
+            event["event_id"],
+        )
+    )
+    return events
+
+
+def snapshot_body(document: Any) -> bytes:
+    """
+    Serializes and compresses ```document``` deterministically. Keys are
+    sorted since DynamoDB does not keep attribute order, and mtime=0 keeps the
+    gzip header free of the current time.
+    """
+
+    payload = json.dumps(
+        document,
+        default=to_json_value,
+        ensure_ascii=False,
+        separators=(",", ":"),
+        sort_keys=True,
+    ).encode("utf-8")
+    return gzip.compress(payload, compresslevel=9, mtime=0)
+
+
+def existing_etags(bucket_name: str, prefix: str) -> Dict[str, str]:
+    paginator = client("s3").get_paginator("list_objects_v2")
+    etags = {}
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+        for obj in page.get("Contents", []):
+            etags[obj["Key"]] = obj["ETag"].strip('"')
+    return etags
+
+
+def build_snapshots(events: List[Dict[str, Any]], prefix: str) -> Dict[str, Any]:
+    snapshots: Dict[str, Any] = {}
+    by_day = defaultdict(list)
+
+    for event in events:
+        snapshots[f"{prefix}events/{event['event_id']}.json"] = event
+        if event.get("start_date"):
+            by_day[event["start_date"]].append(event)
+
+    for day, day_events in by_day.items():
+        snapshots[f"{prefix}days/{day}.json"] = day_events
+
+    snapshots[f"{prefix}events.json"] = [
+        {
+            name: value
+            for name, value in event.items()
+            if name not in DETAIL_ONLY_ATTRIBUTES
+        }
+        for event in events
+    ]
+    return snapshots
+
+
+def handler(event, context):
+    bucket_name = os.environ["SNAPSHOTS_BUCKET_NAME"]
+    prefix = os.environ.get("SNAPSHOT_PREFIX", "snapshots/")
+    cache_control = os.environ.get("SNAPSHOT_CACHE_CONTROL", "public, max-age=300")
+
+    events = scan_events(os.environ["TABLE_NAME"])
+    snapshots = build_snapshots(events, prefix)
+    etags = existing_etags(bucket_name, prefix)
+
+    written = 0
+    for key, document in snapshots.items():
+        body = snapshot_body(document)
+        # Single part uploads get the MD5 of the body as their ETag
+        if etags.get(key) == hashlib.md5(body).hexdigest():
+            continue
+        client("s3").put_object(
+            Bucket=bucket_name,
+            Key=key,
+            Body=body,
+            ContentType="application/json",
+            ContentEncoding="gzip",
+            CacheControl=cache_control,
+        )
+        written += 1
+
+    stale_keys = sorted(set(etags) - set(snapshots))
+    for start in range(0, len(stale_keys), DELETE_BATCH_SIZE):
+        client("s3").delete_objects(
+            Bucket=bucket_name,
+            Delete={
+                "Objects": [
+                    {"Key": key}
+                    for key in stale_keys[start : start + DELETE_BATCH_SIZE]
+                ],
+                "Quiet": True,
+            },
+        )
+
+    summary = {
+        "published_at": datetime.now(timezone.utc).isoformat(),
+        "events": len(events),
+        "snapshots": len(snapshots),
+        "written": written,
+        "unchanged": len(snapshots) - written,
+        "deleted": len(stale_keys),
+    }
+    print(f"Published snapshots to s3://{bucket_name}/{prefix}: {summary}")
+    return summary
@@ -2,46 +2,237 @@
 Lambda function to fetch new rss data.
 """
 
+import hashlib
 import json
 import os
+import zlib
 from datetime import datetime, timezone
-from urllib import request
+from typing import Any, Dict, List, Optional
+from urllib import error, request
 
-import boto3
+from aws_clients import client
 
-s3_client = boto3.client("s3")
+# Validators and digest of the last feed we fetched. Rewritten on every run so
+# the bronze lifecycle rule never moves it to an archive storage class.
+FEED_STATE_KEY = "state/rss_feed_state.json"
+
+# Size of the reads taken off the HTTP response
+READ_CHUNK_SIZE = 64 * 1024
+
+# S3 rejects multipart parts smaller than 5 MiB, except for the last one
+MIN_PART_SIZE = 5 * 1024 * 1024
+
+
+def load_feed_state(bucket_name: str) -> Dict[str, Any]:
+    """
+    Returns the state stored by the previous run, or an empty dict on the first run.
+    """
+
+    s3_client = client("s3")
+    try:
+        obj = s3_client.get_object(Bucket=bucket_name, Key=FEED_STATE_KEY)
+    except s3_client.exceptions.NoSuchKey:
+        return {}
+    return json.loads(obj["Body"].read())
+
+
+def save_feed_state(bucket_name: str, state: Dict[str, Any]) -> None:
+    state["checked_at"] = datetime.now(timezone.utc).isoformat()
+    client("s3").put_object(
+        Bucket=bucket_name,
+        Key=FEED_STATE_KEY,
+        Body=json.dumps(state).encode("utf-8"),
+        ContentType="application/json",
+    )
+
+
+def conditional_headers(state: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Builds If-None-Match / If-Modified-Since headers from the stored validators.
+    """
+
+    headers = {}
+    if state.get("etag"):
+        headers["If-None-Match"] = state["etag"]
+    if state.get("last_modified"):
+        headers["If-Modified-Since"] = state["last_modified"]
+    return headers
+
+
+class BronzeObjectWriter:
+    """
+    Compresses the feed as it is read and uploads it to S3.
+
+    Compressed bytes are buffered until a full multipart part is available, so
+    memory stays around ```MIN_PART_SIZE``` regardless of the feed size. Feeds
+    that compress to less than one part are sent with a single put_object.
+    """
+
+    def __init__(self, bucket_name: str, key: str, compression: str) -> None:
+        self.bucket_name = bucket_name
+        self.key = key
+        self.content_encoding = "gzip" if compression == "gzip" else None
+        # wbits=31 makes zlib write a gzip header and trailer
+        self.compressor = zlib.compressobj(wbits=31) if self.content_encoding else None
+        self.buffer = bytearray()
+        self.upload_id: Optional[str] = None
+        self.parts: List[Dict[str, Any]] = []
+        self.compressed_size = 0
+
+    def _object_args(self) -> Dict[str, Any]:
+        object_args = {
+            "Bucket": self.bucket_name,
+            "Key": self.key,
+            "ContentType": "application/xml",
+        }
+        if self.content_encoding:
+            object_args["ContentEncoding"] = self.content_encoding
+        return object_args
+
+    def _upload_part(self) -> None:
+        if self.upload_id is None:
+            response = client("s3").create_multipart_upload(**self._object_args())
+            self.upload_id = response["UploadId"]
+
+        part_number = len(self.parts) + 1
+        response = client("s3").upload_part(
+            Bucket=self.bucket_name,
+            Key=self.key,
+            UploadId=self.upload_id,
+            PartNumber=part_number,
+            Body=bytes(self.buffer),
+        )
+        self.parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+        self.compressed_size += len(self.buffer)
+        self.buffer.clear()
+
+    def write(self, chunk: bytes) -> None:
+        self.buffer += self.compressor.compress(chunk) if self.compressor else chunk
+        if len(self.buffer) >= MIN_PART_SIZE:
+            self._upload_part()
+
+    def finish(self) -> None:
+        """
+        Flushes the compressor and commits the object.
+        """
+
+        if self.compressor:
+            self.buffer += self.compressor.flush()
+
+        if self.upload_id is None:
+            client("s3").put_object(Body=bytes(self.buffer), **self._object_args())
+            self.compressed_size += len(self.buffer)
+            return
+
+        self._upload_part()
+        client("s3").complete_multipart_upload(
+            Bucket=self.bucket_name,
+            Key=self.key,
+            UploadId=self.upload_id,
+            MultipartUpload={"Parts": self.parts},
+        )
+
+    def abort(self) -> None:
+        """
+        Drops any parts already uploaded. Nothing is visible in the bucket afterwards.
+        """
+
+        if self.upload_id is not None:
+            client("s3").abort_multipart_upload(
+                Bucket=self.bucket_name, Key=self.key, UploadId=self.upload_id
+            )
+            self.upload_id = None
+
+
+def skipped_response(reason: str) -> Dict[str, Any]:
+    print(f"Skipping upload, feed {reason}")
+    return {
+        "statusCode": 200,
+        "skipped": True,
+        "body": json.dumps(
+            {
+                "status": "skipped",
+                "message": f"RSS feed {reason}",
+            }
+        ),
+    }
 
 
 def handler(event, context):
     """
     Lambda handler to fetch rss data and put
-    it into data lake bronze bucket
+    it into data lake bronze bucket.
+
+    The upload is skipped when the server answers 304 or the feed is
+    byte-identical to the last one we stored, and ```skipped``` is set in the
+    response so the state machine can stop early.
+
+    The feed is streamed to S3 in chunks, gzip-compressed unless
+    ```BRONZE_COMPRESSION``` is set to ```none```.
     """
 
     rss_url = os.environ["RSS_FEED_URL"]
     bucket_name = os.environ["BRONZE_BUCKET_NAME"]
+    compression = os.environ.get("BRONZE_COMPRESSION", "gzip")
 
     try:
-        rss_response = request.urlopen(rss_url, timeout=30)
-        content = rss_response.read()
+        state = load_feed_state(bucket_name)
+        rss_request = request.Request(rss_url, headers=conditional_headers(state))
+
+        try:
+            rss_response = request.urlopen(rss_request, timeout=30)
+        except error.HTTPError as e:
+            if e.code != 304:
+                raise
+            save_feed_state(bucket_name, state)
+            return skipped_response("not modified")
 
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        s3_key = f"new/events_{timestamp}.xml"
+        extension = ".xml.gz" if compression == "gzip" else ".xml"
+        s3_key = f"new/events_{timestamp}{extension}"
 
-        s3_client.put_object(
-            Bucket=bucket_name, Key=s3_key, Body=content, ContentType="application/xml"
-        )
+        writer = BronzeObjectWriter(bucket_name, s3_key, compression)
+        hasher = hashlib.sha256()
+        content_size = 0
+
+        try:
+            for chunk in iter(lambda: rss_response.read(READ_CHUNK_SIZE), b""):
+                hasher.update(chunk)
+                content_size += len(chunk)
+                writer.write(chunk)
+
+            digest = hasher.hexdigest()
+            previous_digest = state.get("sha256")
+
+            state["etag"] = rss_response.headers.get("ETag")
+            state["last_modified"] = rss_response.headers.get("Last-Modified")
+            state["sha256"] = digest
+
+            if digest == previous_digest:
+                writer.abort()
+                save_feed_state(bucket_name, state)
+                return skipped_response("unchanged")
+
+            writer.finish()
+        except Exception:
+            writer.abort()
+            raise
+
+        save_feed_state(bucket_name, state)
 
         print(f"Successfully uploaded RSS data to s3://{bucket_name}/{s3_key}")
 
         return {
             "statusCode": 200,
+            "skipped": False,
             "body": json.dumps(
                 {
                     "status": "success",
                     "message": "RSS feed processed successfully",
                     "s3_location": f"s3://{bucket_name}/{s3_key}",
-                    "content_size": len(content),
+                    "content_size": content_size,
+                    "compressed_size": writer.compressed_size,
+                    "sha256": digest,
                 }
             ),
         }
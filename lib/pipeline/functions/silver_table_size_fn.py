@@ -0,0 +1,55 @@
+"""
+Function that returns the row count and data size of the silver Iceberg table,
+so the silver to DynamoDB workflow can pick the Lambda or the Glue sync.
+
+Both come from the summary of the current snapshot in the table's metadata
+file, the table itself is never read.
+"""
+
+import json
+from typing import Any, Dict, Tuple
+
+from aws_clients import client
+
+SILVER_EVENTS_TABLE = "uc_events"
+
+
+def split_s3_uri(uri: str) -> Tuple[str, str]:
+    bucket_name, _, key = uri.removeprefix("s3://").partition("/")
+    return bucket_name, key
+
+
+def snapshot_summary(metadata: Dict[str, Any]) -> Dict[str, str]:
+    """
+    Returns the summary of the current snapshot, empty before the first write.
+    """
+
+    snapshot_id = metadata.get("current-snapshot-id")
+    for snapshot in metadata.get("snapshots", []):
+        if snapshot["snapshot-id"] == snapshot_id:
+            return snapshot.get("summary", {})
+    return {}
+
+
+def handler(event, context):
+    glue = client("glue")
+    try:
+        table = glue.get_table(
+            DatabaseName=event["SILVER_DATABASE"], Name=SILVER_EVENTS_TABLE
+        )["Table"]
+    except glue.exceptions.EntityNotFoundException:
+        return {"exists": False, "total_records": 0, "total_bytes": 0}
+
+    bucket_name, key = split_s3_uri(table["Parameters"]["metadata_location"])
+    obj = client("s3").get_object(Bucket=bucket_name, Key=key)
+    summary = snapshot_summary(json.loads(obj["Body"].read()))
+
+    total_records = int(summary.get("total-records", 0))
+    total_bytes = int(summary.get("total-files-size", 0))
+    print(f"{SILVER_EVENTS_TABLE} holds {total_records} rows in {total_bytes} bytes")
+
+    return {
+        "exists": True,
+        "total_records": total_records,
+        "total_bytes": total_bytes,
+    }
@@ -1,28 +1,54 @@
+import json
 import logging
-import re
 import sys
-import unicodedata
-from dataclasses import dataclass
-from datetime import datetime, timezone, date
-from typing import Any, Dict, List, Optional
+from contextlib import closing
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 import boto3
-import feedparser
-from feedparser import FeedParserDict
 from awsglue.context import DataFrame, GlueContext
 from awsglue.job import Job
 from awsglue.utils import getResolvedOptions
-from bs4 import BeautifulSoup
+from pyspark.conf import SparkConf
 from pyspark.context import SparkContext
-from pyspark.sql import Row, Window
+from pyspark.sql import Window
 from pyspark.sql import functions as F
-from uc_types import Event, file_schema
+from pyspark.sql.types import StringType
+from uc_changes import (
+    changeset_base_snapshot_id,
+    changeset_key,
+    changeset_run_id,
+    copy_to_processed_bucket,
+    write_latest_changeset,
+)
+from uc_spark import (
+    ICEBERG_CATALOG,
+    SNAPSHOT_MAX_AGE_DAYS,
+    SNAPSHOT_RETAIN_LAST,
+    TuningProfile,
+    arrow_conf,
+    drop_legacy_silver_table,
+    effective_tuning,
+    iceberg_conf,
+    silver_events_identifier,
+    silver_events_table,
+    size_shuffle_partitions,
+    table_record_count,
+    tuning_conf,
+)
+from uc_transform import (
+    FeedItem,
+    get_digits_from_guid,
+    iter_feed_entries,
+    open_bronze,
+    parse_entry,
+    sort_source_keys,
+)
+from uc_types import EVENT_FIELDS, Event, EventColumns, file_schema
 
 s3_client = boto3.client("s3")
-spark_context = SparkContext()
-glue_context = GlueContext(spark_context)
-spark_session = glue_context.spark_session
-job = Job(glue_context)
+glue_client = boto3.client("glue")
 
 # Configure logger
 logging.basicConfig(
@@ -37,30 +63,86 @@ logger = logging.getLogger(__name__)
 class Args:
     """
     Data type for args coming from the glue job
+
+    Exactly one of the source key arguments is expected:
+    ```unprocessed_source_key``` (a single key), ```source_keys``` (a JSON list
+    of keys) or ```source_keys_manifest``` (the key of a JSON list written by
+    list_brz_files_fn). ```maintenance_only``` runs only the silver table
+    maintenance and takes no source keys.
     """
 
     job_name: str
-    unprocessed_source_key: str
     source_bucket_name: str
     target_bucket_name: str
+    silver_database_name: str
+    unprocessed_source_key: Optional[str]
+    source_keys: Optional[str]
+    source_keys_manifest: Optional[str]
+    job_run_id: Optional[str]
+    spark_tuning: Optional[str]
+    maintenance_only: bool
+    parallel_parse_min_entries: int
+
+
+def resolve_optional_args(names: List[str]) -> Dict[str, str]:
+    """
+    getResolvedOptions fails on missing arguments, so only resolve the ones passed in.
+    """
+
+    present = [name for name in names if f"--{name}" in sys.argv]
+    return getResolvedOptions(sys.argv, present) if present else {}
 
 
 _args = getResolvedOptions(
     sys.argv,
     [
         "JOB_NAME",
-        "UNPROCESSED_SOURCE_KEY",
         "SOURCE_BUCKET_NAME",
         "TARGET_BUCKET_NAME",
+        "SILVER_DATABASE_NAME",
     ],
 )
+_optional_args = resolve_optional_args(
+    [
+        "UNPROCESSED_SOURCE_KEY",
+        "SOURCE_KEYS",
+        "SOURCE_KEYS_MANIFEST",
+        "JOB_RUN_ID",
+        "SPARK_TUNING",
+        "MAINTENANCE_ONLY",
+        "PARALLEL_PARSE_MIN_ENTRIES",
+    ]
+)
 
 args = Args(
     job_name=_args["JOB_NAME"],
-    unprocessed_source_key=_args["UNPROCESSED_SOURCE_KEY"],
     source_bucket_name=_args["SOURCE_BUCKET_NAME"],
     target_bucket_name=_args["TARGET_BUCKET_NAME"],
+    silver_database_name=_args["SILVER_DATABASE_NAME"],
+    unprocessed_source_key=_optional_args.get("UNPROCESSED_SOURCE_KEY"),
+    source_keys=_optional_args.get("SOURCE_KEYS"),
+    source_keys_manifest=_optional_args.get("SOURCE_KEYS_MANIFEST"),
+    job_run_id=_optional_args.get("JOB_RUN_ID"),
+    spark_tuning=_optional_args.get("SPARK_TUNING"),
+    maintenance_only=_optional_args.get("MAINTENANCE_ONLY", "false").lower() == "true",
+    # Below this many entries a Spark job costs more than it saves
+    parallel_parse_min_entries=int(
+        _optional_args.get("PARALLEL_PARSE_MIN_ENTRIES", "2000")
+    ),
+)
+
+tuning = TuningProfile.from_json(args.spark_tuning)
+
+spark_context = SparkContext(
+    conf=SparkConf().setAll(
+        iceberg_conf(f"s3://{args.target_bucket_name}/")
+        + arrow_conf()
+        + tuning_conf(tuning)
+    )
 )
+glue_context = GlueContext(spark_context)
+spark_session = glue_context.spark_session
+job = Job(glue_context)
 
 job.init(args.job_name, _args)
 
@@ -68,196 +150,535 @@ job.init(args.job_name, _args)
 # Helper functions
 #########################
 
-date_pattern = r"(\d{1,2}) (Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) (\d{4})"
-time_pattern = r"(\d{2}:\d{2}:\d{2})"
 
+def parse_entries(entries: List[Dict[str, str]]) -> List[Event]:
+    """
+    Parses the entries, on the executors when there are at least
+    ```args.parallel_parse_min_entries``` of them. collect() returns partitions
+    in order and each partition keeps its input order, so the result lines up
+    with ```entries```.
+    """
 
-def extract_description(entry: FeedParserDict) -> str:
-    try:
-        html = str(entry.get("description", ""))
-        soup = BeautifulSoup(html, "html.parser")
-        desc = soup.select_one(".p-description")
-        if desc is None:
-            return ""
+    if len(entries) < args.parallel_parse_min_entries:
+        return [parse_entry(entry) for entry in entries]
 
-        # Preserve sentence spacing, but no layout noise
-        text = desc.get_text(separator=" ", strip=True)
+    logger.info(f"Parsing {len(entries)} entries on the executors.")
+    num_slices = min(spark_context.defaultParallelism, len(entries))
+    return spark_context.parallelize(entries, num_slices).map(parse_entry).collect()
 
-        return unicodedata.normalize("NFKC", text)
-    except Exception:
-        return ""
 
+def parsed_items(
+    pending: List[Tuple[str, Optional[int], Optional[Dict[str, str]]]],
+) -> Iterator[FeedItem]:
+    """
+    Yields the ```(fingerprint, event id, entry)``` of ```pending``` as feed
+    items in the same order, parsing the ones that come with an entry.
+    """
 
-def get_digits_from_guid(guid: str) -> int:
-    try:
-        guid_only = guid.rsplit("/")[-1]
-        return int(guid_only)
-    except ValueError:
-        raise Exception(f"Invalid GUID: {guid}")
-
-
-def get_field(entry: FeedParserDict, field_name: str) -> Optional[str]:
-    value = entry.get(field_name)
-    if value:
-        return str(value).strip()
-    return None
-
-
-def parse_rss(xml_byte_content: str) -> List[Event]:
-    logger.info("Parsing content...")
-    events: List[Event] = []
-    feed = feedparser.parse(xml_byte_content)
-
-    for entry in feed.entries:
-        title = str(entry["title"]).strip()
-        event_id = get_digits_from_guid(guid=str(entry["guid"]).strip())
-        host = get_field(entry, "host")
-        location = re.sub(
-            r"[^\x00-\x7F]+", " ", str(entry["location"] if entry["location"] else "")
-        ).strip()
-        link = get_field(entry, "link")
-
-        start_date_match = re.search(date_pattern, str(entry["start"]))
-        start_date: Optional[date] = None
-        if start_date_match:
-            start_date = datetime.strptime(start_date_match.group(0), "%d %b %Y").date()
+    events = iter(
+        parse_entries([entry for _, _, entry in pending if entry is not None])
+    )
+    for fingerprint, event_id, entry in pending:
+        if entry is not None:
+            event = next(events)
+            yield FeedItem(event.event_id, fingerprint, event)
         else:
-            logger.warning(f"Start date was missing for event: {event_id}.")
-            raise ValueError(f"Start date was missing for event: {event_id}.")
-
-        end_date_match = re.search(date_pattern, str(entry["end"]))
-        end_date: Optional[date] = None
-        if end_date_match:
-            end_date = datetime.strptime(end_date_match.group(0), "%d %b %Y").date()
-
-        start_time_match = re.search(time_pattern, str(entry["start"]))
-        start_time: Optional[str] = None
-        end_time: Optional[str] = None
-
-        if start_time_match is not None:
-            start_time = start_time_match.group(0)
-
-        end_time_match = re.search(time_pattern, str(entry["end"]))
-        if end_time_match is not None:
-            end_time = end_time_match.group(0)
-
-        event_description = extract_description(entry)
-
-        events.append(
-            Event(
-                event_id=event_id,
-                title=title,
-                host=host,
-                start_date=start_date,
-                end_date=end_date,
-                start_time=start_time,
-                end_time=end_time,
-                event_description=event_description,
-                location=location,
-                external_link=link,
-            )
-        )
+            yield FeedItem(event_id, fingerprint, None)
+
+
+def parse_rss(
+    bucket_name: str, key: str, known_fingerprints: Set[str]
+) -> Iterator[FeedItem]:
+    """
+    Streams the bronze object and yields its items in feed order. Items
+    already in silver (```known_fingerprints```) are not parsed and come
+    without an event.
+
+    The other entries are gathered in batches of
+    ```args.parallel_parse_min_entries```: full batches are parsed on the
+    executors, the last, smaller one on the driver. Feeds with fewer new
+    items than that never start a Spark job, and the driver never holds more
+    than one batch of entries.
+    """
 
-    logger.info("Parsing complete.")
-    return events
+    logger.info(f"Parsing s3://{bucket_name}/{key}")
+    obj = s3_client.get_object(Bucket=bucket_name, Key=key)
+    with closing(obj["Body"]) as body:
+        pending: List[Tuple[str, Optional[int], Optional[Dict[str, str]]]] = []
+        unparsed = 0
+        for fingerprint, entry in iter_feed_entries(open_bronze(body)):
+            if fingerprint in known_fingerprints:
+                event_id = get_digits_from_guid(entry["guid"])
+                pending.append((fingerprint, event_id, None))
+            else:
+                pending.append((fingerprint, None, entry))
+                unparsed += 1
 
+            if unparsed >= args.parallel_parse_min_entries:
+                yield from parsed_items(pending)
+                pending, unparsed = [], 0
 
-def events_to_dataframe(events: list[Event], s3_key: str) -> DataFrame:
+        yield from parsed_items(pending)
+
+
+def silver_snapshot(table_name: str) -> Optional[DataFrame]:
+    """
+    Returns silver as of its current snapshot, or None while the table or its
+    item_fingerprint column don't exist yet. The fingerprint index and the
+    rows carried forward are both read from it, so they always agree.
+    """
+
+    if not spark_session.catalog.tableExists(table_name):
+        return None
+    snapshot_id = current_snapshot_id(table_name)
+    if snapshot_id is None:
+        return None
+
+    silver_df = spark_session.sql(
+        f"SELECT * FROM {table_name} VERSION AS OF {snapshot_id}"
+    )
+    if "item_fingerprint" not in silver_df.columns:
+        return None
+    return silver_df
+
+
+def fingerprint_index(silver_df: Optional[DataFrame]) -> Set[str]:
+    if silver_df is None:
+        return set()
+    return {
+        row.item_fingerprint
+        for row in silver_df.select("item_fingerprint").dropna().toLocalIterator()
+    }
+
+
+@dataclass
+class GatheredEvents:
     """
+    The rows of every source file, with what the driver learned about them
+    while gathering, so later steps don't need a Spark job to find out.
+    """
+
+    df: DataFrame
+    row_count: int
+    source_count: int
+    # Whether any event_id appears more than once across the source files
+    has_duplicate_ids: bool
+
+
+def events_to_dataframe(
+    items_by_key: List[Tuple[str, Iterable[FeedItem]]],
+    silver_df: Optional[DataFrame],
+) -> GatheredEvents:
+    """
+    Builds one dataframe out of the items of every source key.
     key example: new/events_20251210_063602.xml
+
+    The items of each key are consumed once, so they may be a generator.
+    Parsed events are gathered column by column into an Arrow table, which
+    Spark converts in bulk since Arrow is enabled in the session. Items that
+    were not parsed because silver already holds them are carried forward
+    from ```silver_df``` by fingerprint, with this run's record_source and
+    load_date.
     """
 
-    logger.info(f"Converting events to spark dataframe for {s3_key}")
+    logger.info(f"Converting items of {len(items_by_key)} file(s) to spark dataframe")
     load_date = datetime.now(tz=timezone.utc).isoformat()
-    rows: List[Dict[str, Any]] = []
-    _, filename = s3_key.rsplit("/", 1)
-
-    for event in events:
-        row: Dict[str, Any] = event.to_dict()
-        row["record_source"] = filename
-        row["load_date"] = load_date
-        rows.append(row)
+    columns = EventColumns()
+    fingerprints: List[str] = []
+    carried: List[Tuple[str, str]] = []
+    seen_ids: Set[int] = set()
+    has_duplicate_ids = False
+
+    for s3_key, items in items_by_key:
+        _, filename = s3_key.rsplit("/", 1)
+        for item in items:
+            if item.event_id in seen_ids:
+                has_duplicate_ids = True
+            seen_ids.add(item.event_id)
+
+            if item.event is None:
+                carried.append((item.fingerprint, filename))
+            else:
+                columns.append(item.event, record_source=filename, load_date=load_date)
+                fingerprints.append(item.fingerprint)
+
+    logger.info(
+        f"Parsed {len(fingerprints)} new or changed items, "
+        f"carrying {len(carried)} unchanged items forward."
+    )
 
+    # Spark 3.5 takes Arrow data through pandas, dates stay datetime.date objects
+    parsed_pdf = columns.to_arrow().to_pandas()
+    parsed_pdf["item_fingerprint"] = fingerprints
     spark_df = spark_session.createDataFrame(
-        [Row(**r) for r in rows], schema=file_schema()
+        parsed_pdf, schema=file_schema().add("item_fingerprint", StringType())
     )
+
+    if carried:
+        carried_df = spark_session.createDataFrame(
+            carried, schema="item_fingerprint string, record_source string"
+        )
+        spark_df = spark_df.unionByName(
+            silver_df.select(*EVENT_FIELDS, "item_fingerprint")
+            .join(carried_df, on="item_fingerprint")
+            .withColumn("load_date", F.lit(load_date))
+        )
+
     logger.info("Spark dataframe created with given schema.")
-    return spark_df
+    return GatheredEvents(
+        df=spark_df,
+        row_count=len(fingerprints) + len(carried),
+        source_count=len(items_by_key),
+        has_duplicate_ids=has_duplicate_ids,
+    )
 
 
-def write_deduplicated(new_df, output_path):
-    try:
-        existing_df = spark_session.read.parquet(output_path)
-        combined_df = existing_df.union(new_df)
-    except Exception as e:
-        if "Path does not exist" in str(e) or "NoSuchKey" in str(e):
-            logger.info("No existing data found, treating as first run.")
-            combined_df = new_df
-        else:
-            logger.error(f"Unexpected error reading existing parquet: {e}")
-            raise
-
-    window = Window.partitionBy("event_id").orderBy(F.desc("record_source"))
-    deduped_df = (
-        combined_df.withColumn("rank", F.row_number().over(window))
-        .filter(F.col("rank") == 1)
-        .drop("rank")
+def with_content_hash(df: DataFrame) -> DataFrame:
+    """
+    Adds a sha256 over the event fields. record_source and load_date are left
+    out so the same event loaded from another file hashes the same.
+    """
+
+    values = [
+        F.coalesce(F.col(field.name).cast("string"), F.lit("\u0000"))
+        for field in fields(Event)
+    ]
+    return df.withColumn("content_hash", F.sha2(F.concat_ws("\u001f", *values), 256))
+
+
+def ensure_silver_layout(table_name: str):
+    """
+    Partitions silver by the month of start_date so date range queries only
+    read the matching months. Writes are shuffled so each month is written by
+    one task, sorted by start date and time, which avoids many tiny files and
+    keeps the min/max stats of each file narrow.
+
+    Iceberg's partitions metadata table has no ```partition``` column while
+    the table is unpartitioned, which is how tables created before this
+    layout are picked up.
+    """
+
+    if "partition" in spark_session.table(f"{table_name}.partitions").columns:
+        return
+
+    logger.info(f"Partitioning {table_name} by month of start_date.")
+    spark_session.sql(
+        f"ALTER TABLE {table_name} ADD PARTITION FIELD months(start_date) AS start_month"
+    )
+    spark_session.sql(
+        f"""
+        ALTER TABLE {table_name}
+        WRITE DISTRIBUTED BY PARTITION LOCALLY ORDERED BY start_date, start_time
+        """
+    )
+
+
+def ensure_fingerprint_column(table_name: str):
+    """
+    Adds the item_fingerprint column to tables created before it existed.
+    Their rows are parsed again on the next load and get it filled in.
+    """
+
+    if "item_fingerprint" in spark_session.table(table_name).columns:
+        return
+
+    logger.info(f"Adding item_fingerprint to {table_name}.")
+    spark_session.sql(f"ALTER TABLE {table_name} ADD COLUMN item_fingerprint string")
+
+
+def current_snapshot_id(table_name: str) -> Optional[int]:
+    row = spark_session.sql(
+        f"""
+        SELECT snapshot_id FROM {table_name}.history
+        WHERE is_current_ancestor
+        ORDER BY made_current_at DESC
+        LIMIT 1
+        """
+    ).first()
+    return row.snapshot_id if row else None
+
+
+def write_deduplicated(
+    gathered: GatheredEvents, table_name, latest_source: str
+) -> Optional[int]:
+    """
+    Upserts the newest row of each event into the silver Iceberg table.
+
+    Only events in the newest file (```latest_source```) stay active, older
+    files of a batch only contribute rows. Rows of other events are dropped
+    first with a broadcast semi-join, then the newest row of each remaining
+    event is picked in one shuffle. Each step is skipped when the gathered
+    rows show it has nothing to do: a single file only holds active events,
+    and without duplicate ids every row is already the newest.
+
+    The MERGE inserts new events, updates events whose content hash or item
+    fingerprint changed and deletes events that are no longer in the feed.
+    Iceberg rewrites only the data files holding those ids and commits the
+    whole change as one snapshot.
+
+    Returns the id of the snapshot the merge was applied to, None for a new table.
+    The merged rows stay registered as the ```new_events``` view.
+    """
+
+    deduped_df = gathered.df
+    if gathered.source_count > 1:
+        active_ids = gathered.df.filter(F.col("record_source") == latest_source).select(
+            "event_id"
+        )
+        deduped_df = deduped_df.join(
+            F.broadcast(active_ids), on="event_id", how="left_semi"
+        )
+
+    if gathered.has_duplicate_ids:
+        window = Window.partitionBy("event_id").orderBy(F.desc("record_source"))
+        deduped_df = (
+            deduped_df.withColumn("rank", F.row_number().over(window))
+            .filter(F.col("rank") == 1)
+            .drop("rank")
+        )
+
+    # Cached, the create and the merge both read the view
+    with_content_hash(deduped_df).coalesce(
+        tuning.output_partitions
+    ).cache().createOrReplaceTempView("new_events")
+
+    spark_session.sql(
+        f"""
+        CREATE TABLE IF NOT EXISTS {table_name}
+        USING iceberg
+        LOCATION 's3://{args.target_bucket_name}/uc_events/'
+        TBLPROPERTIES ('format-version' = '2', 'write.merge.mode' = 'copy-on-write')
+        AS SELECT * FROM new_events LIMIT 0
+        """
+    )
+    ensure_silver_layout(table_name)
+    ensure_fingerprint_column(table_name)
+    previous_snapshot_id = current_snapshot_id(table_name)
+
+    spark_session.sql(
+        f"""
+        MERGE INTO {table_name} AS target
+        USING new_events AS source
+        ON target.event_id = source.event_id
+        WHEN MATCHED AND NOT (
+            target.content_hash <=> source.content_hash
+            AND target.item_fingerprint <=> source.item_fingerprint
+        )
+            THEN UPDATE SET *
+        WHEN NOT MATCHED THEN INSERT *
+        WHEN NOT MATCHED BY SOURCE THEN DELETE
+        """
     )
+    return previous_snapshot_id
+
+
+def snapshot_exists(table_name: str, snapshot_id: int) -> bool:
+    return (
+        spark_session.sql(
+            f"SELECT 1 FROM {table_name}.snapshots WHERE snapshot_id = {snapshot_id}"
+        ).first()
+        is not None
+    )
+
 
-    active_ids = new_df.select("event_id").distinct()
-    deduped_df = deduped_df.join(active_ids, on="event_id", how="inner")
+def table_version(table_name: str, snapshot_id: Optional[int]) -> DataFrame:
+    if snapshot_id is None:
+        return spark_session.table(table_name).limit(0)
+    return spark_session.sql(f"SELECT * FROM {table_name} VERSION AS OF {snapshot_id}")
 
-    deduped_df.write.mode("overwrite").parquet(output_path)
 
+def write_changeset(table_name: str, merge_base_snapshot_id: Optional[int]) -> str:
+    """
+    Writes the event ids inserted, updated or deleted since the last changeset
+    to ```s3://<silver>/_changes/<run>/``` as parquet with the columns
+    event_id, change_type and content_hash (null for deletes). A summary of
+    the run is written to ```_changes/_latest.json``` for downstream jobs.
+
+    The changes are computed between the snapshot recorded in the previous
+    ```_latest.json``` and the current one, not from this run's merge alone.
+    A run that failed after its merge committed is retried as a no-op merge,
+    and its changes are still picked up this way. When the recorded snapshot
+    is missing or expired, the snapshot this run merged onto
+    (```merge_base_snapshot_id```) is used instead.
+    """
 
-def copy_to_processed_bucket():
-    filename = args.unprocessed_source_key.split("/")[-1]
-    dest_key = f"processed/{filename}"
+    run_id = changeset_run_id(args.job_run_id)
+    changes_path = f"s3://{args.target_bucket_name}/{changeset_key(run_id)}"
 
-    s3_client.copy_object(
-        Bucket=args.source_bucket_name,
-        Key=dest_key,
-        CopySource={
-            "Bucket": args.source_bucket_name,
-            "Key": args.unprocessed_source_key,
-        },
+    previous_snapshot_id = changeset_base_snapshot_id(
+        s3_client,
+        args.target_bucket_name,
+        lambda snapshot_id: snapshot_exists(table_name, snapshot_id),
+        merge_base_snapshot_id,
     )
+    snapshot_id = current_snapshot_id(table_name)
 
-    s3_client.delete_object(
-        Bucket=args.source_bucket_name, Key=args.unprocessed_source_key
+    source = table_version(table_name, snapshot_id).select("event_id", "content_hash")
+    previous = table_version(table_name, previous_snapshot_id).select(
+        "event_id", F.col("content_hash").alias("previous_content_hash")
     )
-    print(
-        f"moved s3://{args.source_bucket_name}/{args.unprocessed_source_key} -> s3://{args.source_bucket_name}/{dest_key}"
+
+    changes_df = (
+        source.join(previous, on="event_id", how="full_outer")
+        .withColumn(
+            "change_type",
+            F.when(F.col("previous_content_hash").isNull(), "insert")
+            .when(F.col("content_hash").isNull(), "delete")
+            .when(F.col("content_hash") != F.col("previous_content_hash"), "update"),
+        )
+        .filter(F.col("change_type").isNotNull())
+        .select("event_id", "change_type", "content_hash")
+        .cache()
     )
 
+    changes_df.coalesce(1).write.mode("overwrite").parquet(changes_path)
+
+    counts = {"insert": 0, "update": 0, "delete": 0}
+    for row in changes_df.groupBy("change_type").count().collect():
+        counts[row.change_type] = row["count"]
+    changes_df.unpersist()
+
+    write_latest_changeset(
+        s3_client,
+        args.target_bucket_name,
+        run_id,
+        previous_snapshot_id,
+        snapshot_id,
+        counts,
+    )
+
+    logger.info(f"Wrote changeset {counts} to {changes_path}")
+    return changes_path
+
+
+def maintain_silver_table(table_identifier: str):
+    """
+    Compacts months that piled up small files, expires old snapshots and
+    removes files no table version references, such as the parquet files
+    written before silver moved to Iceberg.
+    """
+
+    spark_session.sql(
+        f"""
+        CALL {ICEBERG_CATALOG}.system.rewrite_data_files(
+            table => '{table_identifier}',
+            options => map('min-input-files', '5')
+        )
+        """
+    )
+
+    older_than = (
+        datetime.now(timezone.utc) - timedelta(days=SNAPSHOT_MAX_AGE_DAYS)
+    ).strftime("%Y-%m-%d %H:%M:%S")
+    spark_session.sql(
+        f"""
+        CALL {ICEBERG_CATALOG}.system.expire_snapshots(
+            table => '{table_identifier}',
+            older_than => TIMESTAMP '{older_than}',
+            retain_last => {SNAPSHOT_RETAIN_LAST}
+        )
+        """
+    )
+    spark_session.sql(
+        f"CALL {ICEBERG_CATALOG}.system.remove_orphan_files(table => '{table_identifier}')"
+    )
+
+
+def resolve_source_keys() -> List[str]:
+    """
+    Returns the keys to process, oldest first.
+    """
+
+    if args.source_keys_manifest:
+        obj = s3_client.get_object(
+            Bucket=args.source_bucket_name, Key=args.source_keys_manifest
+        )
+        keys = json.loads(obj["Body"].read())
+    elif args.source_keys:
+        keys = json.loads(args.source_keys)
+    elif args.unprocessed_source_key:
+        keys = [args.unprocessed_source_key]
+    else:
+        raise ValueError(
+            "One of --UNPROCESSED_SOURCE_KEY, --SOURCE_KEYS or --SOURCE_KEYS_MANIFEST is required."
+        )
+
+    return sort_source_keys(keys)
+
 
 def main():
+    if args.maintenance_only:
+        # Scheduled runs for silver loaded by the light Lambda, which can only
+        # expire snapshots, not compact or delete the files they leave behind
+        if spark_session.catalog.tableExists(
+            silver_events_table(args.silver_database_name)
+        ):
+            maintain_silver_table(silver_events_identifier(args.silver_database_name))
+        return
+
+    source_keys: List[str] = []
     try:
+        source_keys = resolve_source_keys()
+        if not source_keys:
+            logger.info("No source keys given, nothing to process.")
+            return
+
         logger.info(
-            f"Staring to process s3://{args.source_bucket_name}/{args.unprocessed_source_key}"
+            f"Staring to process {len(source_keys)} file(s) from s3://{args.source_bucket_name}"
         )
 
-        logger.debug(f"filename: {args.unprocessed_source_key}")
+        if drop_legacy_silver_table(glue_client, args.silver_database_name):
+            logger.info("Dropped the non-Iceberg silver table, it is created again.")
 
-        obj = s3_client.get_object(
-            Bucket=args.source_bucket_name, Key=args.unprocessed_source_key
+        table_name = silver_events_table(args.silver_database_name)
+        silver_df = silver_snapshot(table_name)
+        known_fingerprints = fingerprint_index(silver_df)
+        logger.info(f"Silver holds {len(known_fingerprints)} item fingerprints.")
+
+        # Each file is only read while its items are gathered into columns
+        items_by_key = [
+            (
+                source_key,
+                parse_rss(args.source_bucket_name, source_key, known_fingerprints),
+            )
+            for source_key in source_keys
+        ]
+
+        gathered = events_to_dataframe(items_by_key=items_by_key, silver_df=silver_df)
+
+        # The MERGE shuffles the new rows together with silver
+        size_shuffle_partitions(
+            spark_session,
+            tuning,
+            gathered.row_count + table_record_count(spark_session, table_name),
+        )
+        logger.info(
+            f"Spark tuning {tuning.to_dict()}, effective: {effective_tuning(spark_session)}"
+        )
+
+        latest_source = source_keys[-1].split("/")[-1]
+        merge_base_snapshot_id = write_deduplicated(
+            gathered=gathered, table_name=table_name, latest_source=latest_source
+        )
+        logger.info(f"Merged events into {table_name}")
+
+        write_changeset(
+            table_name=table_name, merge_base_snapshot_id=merge_base_snapshot_id
         )
-        raw_bytes = obj["Body"].read()
-        xml_content = raw_bytes.decode("utf-8", errors="strict")
-        events = parse_rss(xml_byte_content=xml_content)
-        df = events_to_dataframe(events=events, s3_key=args.unprocessed_source_key)
-        output_path = f"s3://{args.target_bucket_name}/uc_events/"
 
-        write_deduplicated(new_df=df, output_path=output_path)
-        logger.info(f"Wrote partitioned parquet to {output_path}")
+        maintain_silver_table(silver_events_identifier(args.silver_database_name))
 
-        copy_to_processed_bucket()
+        for source_key in source_keys:
+            dest_key = copy_to_processed_bucket(
+                s3_client, args.source_bucket_name, source_key
+            )
+            print(
+                f"moved s3://{args.source_bucket_name}/{source_key} -> s3://{args.source_bucket_name}/{dest_key}"
+            )
 
     except Exception as e:
-        logger.error(
-            f"Failed to process key: {args.unprocessed_source_key} {e}", exc_info=True
-        )
-        raise Exception(f"Failed to process key: {args.unprocessed_source_key} {e}")
+        logger.error(f"Failed to process keys: {source_keys} {e}", exc_info=True)
+        raise Exception(f"Failed to process keys: {source_keys} {e}")
 
 
 if __name__ == "__main__":
@@ -1,13 +1,25 @@
 import sys
-from typing import List
+from typing import Dict, Iterable, Optional
 from dataclasses import dataclass
 
 import boto3
+from botocore.config import Config
 from awsglue.context import DataFrame, GlueContext
 from awsglue.dynamicframe import DynamicFrame
 from awsglue.utils import getResolvedOptions
+from pyspark.conf import SparkConf
 from pyspark.context import SparkContext
-from uc_types import file_schema
+from pyspark.sql import functions as F
+from uc_dynamo import batch_write, write_load_marker
+from uc_spark import (
+    TuningProfile,
+    effective_tuning,
+    iceberg_conf,
+    silver_events_table,
+    size_shuffle_partitions,
+    table_record_count,
+    tuning_conf,
+)
 
 
 @dataclass
@@ -18,7 +30,11 @@ class Args:
 
     job_name: str
     silver_bucket_name: str
+    silver_database_name: str
     dynamo_table_name: str
+    load_marker_key: str
+    sync_mode: str
+    spark_tuning: Optional[str]
 
 
 _args = getResolvedOptions(
@@ -26,21 +42,41 @@ _args = getResolvedOptions(
     [
         "JOB_NAME",
         "SILVER_BUCKET_NAME",
+        "SILVER_DATABASE_NAME",
         "DYNAMO_TABLE",
+        "LOAD_MARKER_KEY",
     ],
 )
 
+# SYNC_MODE "diff" only writes new and changed events, "full" rewrites every
+# event. SPARK_TUNING overrides the TuningProfile as JSON.
+_optional_names = [
+    name for name in ["SYNC_MODE", "SPARK_TUNING"] if f"--{name}" in sys.argv
+]
+_optional_args = (
+    getResolvedOptions(sys.argv, _optional_names) if _optional_names else {}
+)
+
 args = Args(
     job_name=_args["JOB_NAME"],
     silver_bucket_name=_args["SILVER_BUCKET_NAME"],
+    silver_database_name=_args["SILVER_DATABASE_NAME"],
     dynamo_table_name=_args["DYNAMO_TABLE"],
+    load_marker_key=_args["LOAD_MARKER_KEY"],
+    sync_mode=_optional_args.get("SYNC_MODE", "diff"),
+    spark_tuning=_optional_args.get("SPARK_TUNING"),
 )
 
+tuning = TuningProfile.from_json(args.spark_tuning)
+
 s3_client = boto3.client("s3")
-dynamodb = boto3.resource("dynamodb")
-dynamo_table = dynamodb.Table(args.dynamo_table_name)
+dynamodb_region = boto3.session.Session().region_name
 
-sc = SparkContext()
+sc = SparkContext(
+    conf=SparkConf().setAll(
+        iceberg_conf(f"s3://{args.silver_bucket_name}/") + tuning_conf(tuning)
+    )
+)
 glue_context = GlueContext(sc)
 spark = glue_context.spark_session
 
@@ -60,25 +96,125 @@ def current_dynamodb_data() -> DynamicFrame:
     return dyf
 
 
-def main():
-    try:
-        new_df = spark.read.schema(file_schema()).parquet(
-            f"s3://{args.silver_bucket_name}/uc_events/"
-        )
-        current_dynamodb_df = current_dynamodb_data().toDF()
+def dynamodb_content_hashes() -> DataFrame:
+    """
+    Returns event_id and the content_hash stored with each DynamoDB item.
+    Items written before content hashes existed get a null hash, so they are
+    rewritten once.
+    """
+
+    dynamodb_df = current_dynamodb_data().toDF()
+    if "event_id" not in dynamodb_df.columns:
+        # An empty table comes back without any columns
+        return spark.createDataFrame([], "event_id long, dynamodb_content_hash string")
+    if "content_hash" not in dynamodb_df.columns:
+        dynamodb_df = dynamodb_df.withColumn("content_hash", F.lit(None).cast("string"))
+
+    return dynamodb_df.select(
+        F.col("event_id").cast("long").alias("event_id"),
+        F.col("content_hash").alias("dynamodb_content_hash"),
+    )
+
+
+def classify_sync_actions(silver_df: DataFrame, dynamodb_df: DataFrame) -> DataFrame:
+    """
+    Compares the content hash of every event on both sides and labels each
+    event_id with the action that brings DynamoDB in line with silver:
+    insert, update, delete or unchanged.
+    """
+
+    silver_hashes = silver_df.select(
+        F.col("event_id").cast("long").alias("event_id"),
+        "content_hash",
+        F.lit(True).alias("in_silver"),
+    )
+    dynamodb_hashes = dynamodb_df.withColumn("in_dynamodb", F.lit(True))
+
+    return silver_hashes.join(dynamodb_hashes, on="event_id", how="full_outer").select(
+        "event_id",
+        F.when(F.col("in_dynamodb").isNull(), "insert")
+        .when(F.col("in_silver").isNull(), "delete")
+        .when(F.col("content_hash") == F.col("dynamodb_content_hash"), "unchanged")
+        .otherwise("update")
+        .alias("sync_action"),
+    )
+
 
-        removed_events_df = current_dynamodb_df.join(
-            new_df, on="event_id", how="left_anti"
+def count_sync_actions(actions_df: DataFrame) -> Dict[str, int]:
+    counts = {"insert": 0, "update": 0, "delete": 0, "unchanged": 0}
+    for row in actions_df.groupBy("sync_action").count().collect():
+        counts[row.sync_action] = row["count"]
+    return counts
+
+
+def delete_events_partition(table_name: str, region_name: str):
+    """
+    Returns the function each executor runs over its partition of removed
+    events. Every partition builds its own client, so nothing is pickled
+    from the driver but the table name and the region.
+    """
+
+    def delete_partition(rows: Iterable) -> None:
+        client = boto3.client(
+            "dynamodb",
+            region_name=region_name,
+            config=Config(
+                max_pool_connections=4, retries={"max_attempts": 10, "mode": "adaptive"}
+            ),
+        )
+        batch_write(
+            client,
+            table_name,
+            (
+                {"DeleteRequest": {"Key": {"event_id": {"N": str(row.event_id)}}}}
+                for row in rows
+            ),
         )
 
-        print(f"Deleted events '{removed_events_df.count()}':")
-        removed_events_df.show()
+    return delete_partition
 
-        with dynamo_table.batch_writer() as batch:
-            for row in removed_events_df.collect():
-                batch.delete_item(Key={"event_id": row.event_id})
 
-        dyf = DynamicFrame.fromDF(new_df, glue_context, "events_dyf")
+def main():
+    try:
+        table_name = silver_events_table(args.silver_database_name)
+        # The item fingerprint only drives bronze to silver, it stays out of DynamoDB
+        new_df = spark.table(table_name).drop("item_fingerprint")
+
+        # DynamoDB holds about as many events as silver
+        size_shuffle_partitions(spark, tuning, table_record_count(spark, table_name))
+        print(f"Spark tuning {tuning.to_dict()}, effective: {effective_tuning(spark)}")
+
+        actions_df = classify_sync_actions(new_df, dynamodb_content_hashes()).cache()
+        counts = count_sync_actions(actions_df)
+        print(f"Sync mode '{args.sync_mode}', actions: {counts}")
+
+        # Served from the cached actions, so reporting and deleting don't
+        # rescan silver and DynamoDB
+        removed_events_df = actions_df.filter(F.col("sync_action") == "delete")
+
+        print(f"Deleted events '{counts['delete']}':")
+        if counts["delete"]:
+            removed_events_df.show()
+            removed_events_df.select("event_id").coalesce(
+                tuning.output_partitions
+            ).foreachPartition(
+                delete_events_partition(args.dynamo_table_name, dynamodb_region)
+            )
+
+        if args.sync_mode == "full":
+            upsert_df = new_df
+        else:
+            changed_ids = actions_df.filter(
+                F.col("sync_action").isin("insert", "update")
+            ).select(F.col("event_id").cast("int").alias("event_id"))
+            upsert_df = new_df.join(
+                F.broadcast(changed_ids), on="event_id", how="left_semi"
+            )
+            print(f"Skipped unchanged events '{counts['unchanged']}'")
+
+        dyf = DynamicFrame.fromDF(
+            upsert_df.coalesce(tuning.output_partitions), glue_context, "events_dyf"
+        )
 
         glue_context.write_dynamic_frame.from_options(
             frame=dyf,
@@ -89,6 +225,16 @@ def main():
             },
         )
 
+        actions_df.unpersist()
+
+        write_load_marker(
+            s3_client,
+            args.silver_bucket_name,
+            args.load_marker_key,
+            args.sync_mode,
+            counts,
+        )
+
     except Exception as e:
         print(f"Error: {e}")
         raise
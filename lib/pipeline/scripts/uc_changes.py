@@ -0,0 +1,114 @@
+"""
+A module that contains the changeset protocol shared by the bronze to silver
+Glue job and its Lambda counterpart, and the move of processed bronze files.
+
+Every run writes the event ids it inserted, updated or deleted to
+```_changes/<run>/``` in the silver bucket, as parquet with the columns
+event_id, change_type and content_hash (null for deletes), and then
+```_changes/_latest.json``` with a summary downstream jobs read. Changes are
+diffed from the snapshot the previous summary recorded, so the changes of a
+run that failed after writing silver are picked up by the next one.
+"""
+
+import json
+import logging
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+LATEST_CHANGESET_KEY = "_changes/_latest.json"
+
+
+def changeset_run_id(job_run_id: Optional[str]) -> str:
+    run_timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return f"{run_timestamp}_{job_run_id}" if job_run_id else run_timestamp
+
+
+def changeset_key(run_id: str) -> str:
+    """
+    Returns the prefix the changes of ```run_id``` are written under.
+    """
+
+    return f"_changes/{run_id}/"
+
+
+def recorded_snapshot_id(s3_client, bucket_name: str) -> Optional[int]:
+    """
+    Returns the snapshot the last changeset was computed up to, None before
+    the first changeset.
+    """
+
+    try:
+        obj = s3_client.get_object(Bucket=bucket_name, Key=LATEST_CHANGESET_KEY)
+    except s3_client.exceptions.NoSuchKey:
+        return None
+    return json.loads(obj["Body"].read()).get("snapshot_id")
+
+
+def changeset_base_snapshot_id(
+    s3_client,
+    bucket_name: str,
+    snapshot_exists: Callable[[int], bool],
+    write_base_snapshot_id: Optional[int],
+) -> Optional[int]:
+    """
+    Returns the snapshot to diff this run's changes from: the one recorded by
+    the last changeset, or ```write_base_snapshot_id```, the snapshot this run
+    wrote onto, when there is none or it has been expired.
+    """
+
+    previous_snapshot_id = recorded_snapshot_id(s3_client, bucket_name)
+    if previous_snapshot_id is not None and snapshot_exists(previous_snapshot_id):
+        return previous_snapshot_id
+
+    if previous_snapshot_id is not None:
+        logger.warning(
+            f"Snapshot {previous_snapshot_id} of the last changeset is expired, "
+            f"diffing from {write_base_snapshot_id} instead."
+        )
+    return write_base_snapshot_id
+
+
+def write_latest_changeset(
+    s3_client,
+    bucket_name: str,
+    run_id: str,
+    previous_snapshot_id: Optional[int],
+    snapshot_id: Optional[int],
+    counts: Dict[str, int],
+) -> None:
+    """
+    Records the changeset of ```run_id``` in ```_changes/_latest.json```. Only
+    called once its changes are written.
+    """
+
+    s3_client.put_object(
+        Bucket=bucket_name,
+        Key=LATEST_CHANGESET_KEY,
+        Body=json.dumps(
+            {
+                "run_id": run_id,
+                "path": f"s3://{bucket_name}/{changeset_key(run_id)}",
+                "previous_snapshot_id": previous_snapshot_id,
+                "snapshot_id": snapshot_id,
+                "counts": counts,
+            }
+        ).encode("utf-8"),
+        ContentType="application/json",
+    )
+
+
+def copy_to_processed_bucket(s3_client, bucket_name: str, source_key: str) -> str:
+    """
+    Moves a bronze file from ```new/``` to ```processed/``` and returns its new key.
+    """
+
+    dest_key = f"processed/{source_key.split('/')[-1]}"
+    s3_client.copy_object(
+        Bucket=bucket_name,
+        Key=dest_key,
+        CopySource={"Bucket": bucket_name, "Key": source_key},
+    )
+    s3_client.delete_object(Bucket=bucket_name, Key=source_key)
+    return dest_key
@@ -0,0 +1,73 @@
+"""
+A module that extracts the date and time of the feed's ```start``` and ```end```
+fields, e.g. ```Thu, 11 Dec 2025 22:00:00 GMT```.
+
+It gives the same result as searching the field for the first
+```date_pattern``` match, turning it into a date with
+```strptime("%d %b %Y")```, and searching separately for the first
+```time_pattern``` match. The RFC 822 layout the feed uses is read with one
+anchored match and the date is built directly from a month lookup table.
+Anything else falls back to the two searches. Results are memoized, since
+recurring events repeat the same start and end strings.
+"""
+
+import re
+from datetime import date
+from functools import lru_cache
+from typing import Optional, Tuple
+
+MONTHS = {
+    "Jan": 1,
+    "Feb": 2,
+    "Mar": 3,
+    "Apr": 4,
+    "May": 5,
+    "Jun": 6,
+    "Jul": 7,
+    "Aug": 8,
+    "Sep": 9,
+    "Oct": 10,
+    "Nov": 11,
+    "Dec": 12,
+}
+
+date_pattern = r"(\d{1,2}) (Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) (\d{4})"
+time_pattern = r"(\d{2}:\d{2}:\d{2})"
+
+date_regex = re.compile(date_pattern)
+time_regex = re.compile(time_pattern)
+
+# Optional weekday, then day, month, year and time. Nothing before the time
+# can hold a colon or a date, so both searches would land on the same spans.
+rfc822_regex = re.compile(r"(?:[A-Za-z]{3}, )?" + date_pattern + " " + time_pattern)
+
+# Distinct start and end strings kept per process
+CACHE_SIZE = 8192
+
+
+def to_date(day: str, month: str, year: str) -> date:
+    """
+    Raises ValueError for days the month doesn't have, like ```strptime```.
+    """
+
+    return date(int(year), MONTHS[month], int(day))
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def date_and_time(value: str) -> Tuple[Optional[date], Optional[str]]:
+    """
+    Returns the date and the ```HH:MM:SS``` time found in ```value```, each
+    None when missing.
+    """
+
+    match = rfc822_regex.match(value)
+    if match:
+        day, month, year, time = match.groups()
+        return to_date(day, month, year), time
+
+    date_match = date_regex.search(value)
+    time_match = time_regex.search(value)
+    return (
+        to_date(*date_match.groups()) if date_match else None,
+        time_match.group(0) if time_match else None,
+    )
@@ -0,0 +1,73 @@
+"""
+A module that contains the DynamoDB writes shared by the silver to DynamoDB
+Glue job and its Lambda counterpart.
+"""
+
+import json
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List
+
+# BatchWriteItem accepts at most 25 requests per call
+BATCH_WRITE_MAX_ITEMS = 25
+BATCH_WRITE_MAX_ATTEMPTS = 8
+
+
+def batch_write_with_retry(client, table_name: str, requests: List[dict]) -> None:
+    """
+    Sends one BatchWriteItem call and resends whatever comes back in
+    ```UnprocessedItems```, backing off exponentially with jitter.
+    """
+
+    pending = {table_name: requests}
+    for attempt in range(BATCH_WRITE_MAX_ATTEMPTS):
+        response = client.batch_write_item(RequestItems=pending)
+        pending = response.get("UnprocessedItems") or {}
+        if not pending:
+            return
+        time.sleep(min(0.05 * 2**attempt, 5.0) * (1 + random.random()))
+
+    unprocessed = len(pending.get(table_name, []))
+    raise RuntimeError(f"{unprocessed} DynamoDB writes still unprocessed")
+
+
+def batch_write(client, table_name: str, requests: Iterable[dict]) -> int:
+    """
+    Sends ```requests``` in batches of ```BATCH_WRITE_MAX_ITEMS``` and
+    returns how many were written.
+    """
+
+    batch: List[dict] = []
+    written = 0
+    for request in requests:
+        batch.append(request)
+        if len(batch) == BATCH_WRITE_MAX_ITEMS:
+            batch_write_with_retry(client, table_name, batch)
+            written += len(batch)
+            batch = []
+    if batch:
+        batch_write_with_retry(client, table_name, batch)
+        written += len(batch)
+    return written
+
+
+def write_load_marker(
+    s3_client, bucket_name: str, key: str, sync_mode: str, counts: Dict[str, Any]
+) -> None:
+    """
+    Records that the DynamoDB table was just loaded. The API uses the marker
+    to tell when its cached responses are stale.
+    """
+
+    marker = {
+        "loaded_at": datetime.now(timezone.utc).isoformat(),
+        "sync_mode": sync_mode,
+        "counts": counts,
+    }
+    s3_client.put_object(
+        Bucket=bucket_name,
+        Key=key,
+        Body=json.dumps(marker).encode("utf-8"),
+        ContentType="application/json",
+    )
@@ -0,0 +1,177 @@
+"""
+A module that extracts the text of the event description from the feed HTML.
+
+This replaces building a full BeautifulSoup tree per entry. It gives the same
+result as ```soup.select_one(".p-description").get_text(separator=" ", strip=True)```
+followed by NFKC normalization.
+"""
+
+import html as html_lib
+import unicodedata
+from html.entities import html5 as html5_entities
+from html.parser import HTMLParser
+from typing import List, Optional
+
+DESCRIPTION_CLASS = "p-description"
+
+# Tags BeautifulSoup closes as soon as they open
+VOID_ELEMENTS = frozenset(
+    [
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "keygen",
+        "link",
+        "menuitem",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+        "basefont",
+        "bgsound",
+        "command",
+        "frame",
+        "image",
+        "isindex",
+        "nextid",
+        "spacer",
+    ]
+)
+
+# Strings inside these tags are not returned by BeautifulSoup's get_text
+NON_TEXT_ELEMENTS = frozenset(["rt", "rp", "style", "script", "template"])
+
+
+class _DescriptionClosed(Exception):
+    pass
+
+
+class DescriptionTextParser(HTMLParser):
+    """
+    Single pass parser that only keeps the text inside the first element whose
+    class list contains ```p-description```. Parsing stops as soon as that
+    element is closed.
+    """
+
+    def __init__(self) -> None:
+        # References are resolved in handle_charref/handle_entityref the same
+        # way BeautifulSoup does, so text splits into the same strings
+        super().__init__(convert_charrefs=False)
+        self.open_tags: List[str] = []
+        self.non_text_depth = 0
+        # Depth of the description element in open_tags once it is found
+        self.description_depth: Optional[int] = None
+        self.found = False
+        self.pending_data: List[str] = []
+        self.parts: List[str] = []
+
+    def _flush(self) -> None:
+        # One string per run of text between two pieces of markup, like BeautifulSoup
+        if not self.pending_data:
+            return
+        text = "".join(self.pending_data).strip()
+        self.pending_data = []
+        if text and self.description_depth is not None and not self.non_text_depth:
+            self.parts.append(text)
+
+    def _is_description(self, attrs) -> bool:
+        for name, value in attrs:
+            if name == "class" and value and DESCRIPTION_CLASS in value.split():
+                return True
+        return False
+
+    def _pop_to(self, tag: str) -> None:
+        for index in range(len(self.open_tags) - 1, -1, -1):
+            if self.open_tags[index] == tag:
+                break
+        else:
+            # BeautifulSoup ignores end tags that match nothing open
+            return
+
+        for closed in self.open_tags[index:]:
+            if closed in NON_TEXT_ELEMENTS:
+                self.non_text_depth -= 1
+        del self.open_tags[index:]
+
+        if self.description_depth is not None and index <= self.description_depth:
+            raise _DescriptionClosed()
+
+    def handle_starttag(self, tag, attrs) -> None:
+        self._flush()
+        starts_description = not self.found and self._is_description(attrs)
+        if starts_description:
+            self.found = True
+
+        if tag in VOID_ELEMENTS:
+            if starts_description:
+                raise _DescriptionClosed()
+            return
+
+        if starts_description:
+            self.description_depth = len(self.open_tags)
+        self.open_tags.append(tag)
+        if tag in NON_TEXT_ELEMENTS:
+            self.non_text_depth += 1
+
+    def handle_startendtag(self, tag, attrs) -> None:
+        self._flush()
+        if not self.found and self._is_description(attrs):
+            self.found = True
+            raise _DescriptionClosed()
+
+    def handle_endtag(self, tag) -> None:
+        self._flush()
+        self._pop_to(tag)
+
+    def handle_data(self, data) -> None:
+        self.pending_data.append(data)
+
+    def handle_charref(self, name) -> None:
+        self.pending_data.append(html_lib.unescape(f"&#{name};"))
+
+    def handle_entityref(self, name) -> None:
+        # Unknown names are kept as literal text
+        self.pending_data.append(html5_entities.get(f"{name};", f"&{name}"))
+
+    def handle_comment(self, data) -> None:
+        self._flush()
+
+    def handle_decl(self, decl) -> None:
+        self._flush()
+
+    def handle_pi(self, data) -> None:
+        self._flush()
+
+    def unknown_decl(self, data) -> None:
+        self._flush()
+        # CDATA sections are text, and a string of their own
+        if data.upper().startswith("CDATA["):
+            self.pending_data.append(data[len("CDATA[") :])
+            self._flush()
+
+
+def description_text(html: str) -> str:
+    """
+    Returns the NFKC normalized text of the ```.p-description``` element of
+    ```html```, with its strings stripped and joined by single spaces. Returns
+    an empty string when there is no such element.
+    """
+
+    if DESCRIPTION_CLASS not in html:
+        return ""
+
+    parser = DescriptionTextParser()
+    try:
+        parser.feed(html)
+        parser.close()
+    except _DescriptionClosed:
+        pass
+    parser._flush()
+
+    return unicodedata.normalize("NFKC", " ".join(parser.parts))
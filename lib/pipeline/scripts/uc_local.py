@@ -0,0 +1,185 @@
+"""
+A module that runs the bronze to silver transform without Spark or Glue.
+
+It reads bronze feeds from a local directory, keeps the newest row of every
+active event and writes them as one parquet file with the silver columns.
+Useful to profile the transform on a laptop or to process small loads.
+
+    python lib/pipeline/scripts/uc_local.py --input-dir bronze/ --output silver.parquet
+
+With ```--silver``` pointing at an earlier output, items that didn't change
+since are taken from it instead of being parsed again.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import date, datetime, timezone
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from uc_transform import (
+    content_hash,
+    iter_feed_items,
+    latest_events,
+    open_bronze,
+    sort_source_keys,
+)
+from uc_types import EVENT_FIELDS, Event, EventColumns
+
+logger = logging.getLogger(__name__)
+
+
+def bronze_dir_files(input_dir: str) -> List[str]:
+    """
+    Returns the names of the bronze feeds in ```input_dir```, oldest first.
+    """
+
+    file_names = [
+        name
+        for name in os.listdir(input_dir)
+        if name.endswith((".xml", ".xml.gz"))
+        and os.path.isfile(os.path.join(input_dir, name))
+    ]
+    return sort_source_keys(file_names)
+
+
+def open_bronze_dir(
+    input_dir: str, file_names: Iterable[str]
+) -> Iterator[Tuple[str, BinaryIO]]:
+    """
+    Yields ```(file name, feed stream)``` for each file, opening a file only
+    once the previous one has been read.
+    """
+
+    for file_name in file_names:
+        with open(os.path.join(input_dir, file_name), "rb") as f:
+            yield file_name, open_bronze(f)
+
+
+def events_by_fingerprint(silver) -> Dict[str, Event]:
+    """
+    Returns the events of a silver Arrow table keyed by their item
+    fingerprint. Rows written before fingerprints existed are left out.
+    """
+
+    if silver is None or "item_fingerprint" not in silver.column_names:
+        return {}
+
+    columns = {name: silver.column(name).to_pylist() for name in EVENT_FIELDS}
+    return {
+        fingerprint: Event(**{name: columns[name][i] for name in EVENT_FIELDS})
+        for i, fingerprint in enumerate(silver.column("item_fingerprint").to_pylist())
+        if fingerprint is not None
+    }
+
+
+def transform(
+    sources: Iterable[Tuple[str, BinaryIO]],
+    load_date: Optional[str] = None,
+    silver=None,
+):
+    """
+    Parses and deduplicates ```sources``` (oldest first) and returns a pyarrow
+    table with the silver columns, ordered by start date and time like the
+    silver table.
+
+    Like the Glue job, items whose fingerprint is in ```silver``` (the current
+    silver rows as an Arrow table, optional) are not parsed, their event is
+    taken from silver instead.
+    """
+
+    import pyarrow as pa
+
+    load_date = load_date or datetime.now(tz=timezone.utc).isoformat()
+    known_events = events_by_fingerprint(silver)
+
+    events_by_source = []
+    fingerprints: Dict[Tuple[str, int], str] = {}
+    for record_source, stream in sources:
+        events = []
+        parsed = 0
+        for item in iter_feed_items(stream, known_events):
+            if item.event is None:
+                events.append(known_events[item.fingerprint])
+            else:
+                events.append(item.event)
+                parsed += 1
+            fingerprints[(record_source, item.event_id)] = item.fingerprint
+        logger.info(
+            f"Read {len(events)} events from {record_source}, "
+            f"{len(events) - parsed} of them unchanged from silver"
+        )
+        events_by_source.append((record_source, events))
+
+    rows = latest_events(events_by_source)
+    rows.sort(
+        key=lambda row: (
+            row[1].start_date or date.max,
+            row[1].start_time or "",
+            row[1].event_id,
+        )
+    )
+
+    columns = EventColumns()
+    for record_source, event in rows:
+        columns.append(event, record_source=record_source, load_date=load_date)
+
+    # Same column order as a silver table the Glue job creates
+    table = columns.to_arrow().append_column(
+        pa.field("item_fingerprint", pa.string()),
+        pa.array(
+            [
+                fingerprints[(record_source, event.event_id)]
+                for record_source, event in rows
+            ],
+            type=pa.string(),
+        ),
+    )
+    return table.append_column(
+        pa.field("content_hash", pa.string(), nullable=False),
+        pa.array([content_hash(event) for _, event in rows], type=pa.string()),
+    )
+
+
+def write_parquet(table, output_path: str) -> None:
+    import pyarrow.parquet as pq
+
+    pq.write_table(table, output_path, compression="zstd")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--input-dir", required=True, help="Directory of bronze feeds")
+    parser.add_argument("--output", required=True, help="Parquet file to write")
+    parser.add_argument(
+        "--silver",
+        help="Parquet file of an earlier run, whose unchanged items are not parsed again",
+    )
+    options = parser.parse_args(argv)
+
+    file_names = bronze_dir_files(options.input_dir)
+    if not file_names:
+        logger.info(f"No bronze feeds in {options.input_dir}, nothing to process.")
+        return
+
+    silver = None
+    if options.silver:
+        import pyarrow.parquet as pq
+
+        silver = pq.read_table(options.silver)
+
+    table = transform(open_bronze_dir(options.input_dir, file_names), silver=silver)
+    write_parquet(table, options.output)
+    logger.info(
+        f"Wrote {table.num_rows} events from {len(file_names)} file(s) to {options.output}"
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+        datefmt="%y/%m/%d %H:%M:%S",
+    )
+    main(sys.argv[1:])
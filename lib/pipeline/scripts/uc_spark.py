@@ -0,0 +1,198 @@
+"""
+A module that contains the Spark configuration shared by the Glue jobs.
+"""
+
+import json
+import math
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Name the Glue Data Catalog is registered under in the Spark session
+ICEBERG_CATALOG = "glue_catalog"
+
+SILVER_EVENTS_TABLE = "uc_events"
+
+# Silver snapshots are expired once older than this many days, except the
+# newest ones, whichever engine wrote them
+SNAPSHOT_MAX_AGE_DAYS = 7
+SNAPSHOT_RETAIN_LAST = 5
+
+# Settings the tuning profile touches, logged by every run
+TUNING_KEYS = [
+    "spark.sql.adaptive.enabled",
+    "spark.sql.adaptive.coalescePartitions.enabled",
+    "spark.sql.adaptive.advisoryPartitionSizeInBytes",
+    "spark.sql.adaptive.skewJoin.enabled",
+    "spark.sql.autoBroadcastJoinThreshold",
+    "spark.sql.adaptive.autoBroadcastJoinThreshold",
+    "spark.sql.shuffle.partitions",
+]
+
+
+@dataclass(frozen=True)
+class TuningProfile:
+    """
+    Spark settings for jobs that move thousands of rows, not billions. Spark's
+    defaults (200 shuffle partitions, 10 MB broadcast threshold) turn every
+    window, join and write into hundreds of near-empty tasks and files.
+
+    Jobs take overrides as JSON through ```--SPARK_TUNING```, e.g.
+    ```{"rows_per_partition": 20000}```.
+    """
+
+    # Shuffle partitions are sized to the input at this many rows each,
+    # within the min and max. AQE still merges the ones that turn out small.
+    rows_per_partition: int = 50_000
+    min_shuffle_partitions: int = 2
+    max_shuffle_partitions: int = 200
+    advisory_partition_size: str = "32m"
+    # Small sides of joins up to this size are sent to every executor
+    broadcast_threshold: str = "64m"
+    # Partitions left once results are written out
+    output_partitions: int = 2
+
+    @classmethod
+    def from_json(cls, value: Optional[str]) -> "TuningProfile":
+        return cls(**json.loads(value)) if value else cls()
+
+    def shuffle_partitions(self, row_count: int) -> int:
+        partitions = math.ceil(row_count / self.rows_per_partition)
+        return max(
+            self.min_shuffle_partitions, min(self.max_shuffle_partitions, partitions)
+        )
+
+    def to_dict(self) -> Dict[str, object]:
+        return asdict(self)
+
+
+def iceberg_conf(warehouse_path: str) -> List[Tuple[str, str]]:
+    """
+    Returns the Spark settings that register the Glue Data Catalog as an
+    Iceberg catalog. The job also needs ```--datalake-formats iceberg```.
+    """
+
+    catalog = f"spark.sql.catalog.{ICEBERG_CATALOG}"
+    return [
+        (
+            "spark.sql.extensions",
+            "org.apache.iceberg.spark.extensions.IcebergSparkSessionExtensions",
+        ),
+        (catalog, "org.apache.iceberg.spark.SparkCatalog"),
+        (f"{catalog}.warehouse", warehouse_path),
+        (f"{catalog}.catalog-impl", "org.apache.iceberg.aws.glue.GlueCatalog"),
+        (f"{catalog}.io-impl", "org.apache.iceberg.aws.s3.S3FileIO"),
+    ]
+
+
+def arrow_conf() -> List[Tuple[str, str]]:
+    """
+    Lets createDataFrame convert pandas data through Arrow in bulk instead of
+    pickling it row by row.
+    """
+
+    return [
+        ("spark.sql.execution.arrow.pyspark.enabled", "true"),
+        ("spark.sql.execution.arrow.pyspark.fallback.enabled", "true"),
+    ]
+
+
+def tuning_conf(profile: TuningProfile) -> List[Tuple[str, str]]:
+    """
+    Returns the session settings of ```profile```. Shuffle partitions start at
+    the minimum until ```size_shuffle_partitions``` knows the input size.
+    """
+
+    return [
+        ("spark.sql.adaptive.enabled", "true"),
+        ("spark.sql.adaptive.coalescePartitions.enabled", "true"),
+        (
+            "spark.sql.adaptive.advisoryPartitionSizeInBytes",
+            profile.advisory_partition_size,
+        ),
+        ("spark.sql.adaptive.skewJoin.enabled", "true"),
+        ("spark.sql.autoBroadcastJoinThreshold", profile.broadcast_threshold),
+        ("spark.sql.adaptive.autoBroadcastJoinThreshold", profile.broadcast_threshold),
+        ("spark.sql.shuffle.partitions", str(profile.min_shuffle_partitions)),
+    ]
+
+
+def size_shuffle_partitions(
+    spark_session, profile: TuningProfile, row_count: int
+) -> int:
+    """
+    Sets the shuffle partitions of the session for ```row_count``` input rows
+    and returns how many that is.
+    """
+
+    partitions = profile.shuffle_partitions(row_count)
+    spark_session.conf.set("spark.sql.shuffle.partitions", str(partitions))
+    return partitions
+
+
+def effective_tuning(spark_session) -> Dict[str, Optional[str]]:
+    """
+    Returns the values the session actually runs with for ```TUNING_KEYS```.
+    """
+
+    return {key: spark_session.conf.get(key, None) for key in TUNING_KEYS}
+
+
+def table_record_count(spark_session, table_name: str) -> int:
+    """
+    Returns the row count Iceberg recorded for the current snapshot, without
+    scanning the table. 0 when the table doesn't exist yet.
+    """
+
+    if not spark_session.catalog.tableExists(table_name):
+        return 0
+    row = spark_session.sql(
+        f"""
+        SELECT summary['total-records'] AS total_records FROM {table_name}.snapshots
+        ORDER BY committed_at DESC
+        LIMIT 1
+        """
+    ).first()
+    return int(row.total_records) if row and row.total_records else 0
+
+
+def silver_events_identifier(database_name: str) -> str:
+    """
+    Name of the silver events table inside the catalog, as the Iceberg
+    procedures expect it. The database name is quoted because the Glue
+    database name contains dashes.
+    """
+
+    return f"`{database_name}`.{SILVER_EVENTS_TABLE}"
+
+
+def silver_events_table(database_name: str) -> str:
+    """
+    Fully qualified name of the silver events table.
+    """
+
+    return f"{ICEBERG_CATALOG}.{silver_events_identifier(database_name)}"
+
+
+def drop_legacy_silver_table(glue_client, database_name: str) -> bool:
+    """
+    Drops the silver events table from the Glue catalog when it is not an
+    Iceberg table, like the one the S3 crawler registered before silver moved
+    to Iceberg. Iceberg's catalog treats such a table as missing but cannot
+    create one under the same name. Only the catalog entry is dropped, the
+    old parquet files are removed with the table's orphan files.
+
+    Returns whether a table was dropped.
+    """
+
+    try:
+        table = glue_client.get_table(
+            DatabaseName=database_name, Name=SILVER_EVENTS_TABLE
+        )["Table"]
+    except glue_client.exceptions.EntityNotFoundException:
+        return False
+
+    if table.get("Parameters", {}).get("table_type", "").upper() == "ICEBERG":
+        return False
+
+    glue_client.delete_table(DatabaseName=database_name, Name=SILVER_EVENTS_TABLE)
+    return True
@@ -2,14 +2,12 @@
 A module that contains data types for this project
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import date
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from pyspark.sql.types import DateType, IntegerType, StringType, StructField, StructType
 
-
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Event:
     event_id: int
     title: str
@@ -22,26 +20,21 @@ class Event:
     location: Optional[str]
     external_link: Optional[str]
 
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "event_id": self.event_id,
-            "title": self.title,
-            "host": self.host,
-            "start_date": self.start_date,
-            "end_date": self.end_date,
-            "start_time": self.start_time,
-            "end_time": self.end_time,
-            "event_description": self.event_description,
-            "location": self.location,
-            "external_link": self.external_link,
-        }
-
 
-def file_schema() -> StructType:
+def file_schema():
     """
     Returns a StructType representing the schema of the events file.
+    pyspark is imported here so the module also loads without Spark.
     """
 
+    from pyspark.sql.types import (
+        DateType,
+        IntegerType,
+        StringType,
+        StructField,
+        StructType,
+    )
+
     return StructType(
         [
             StructField("event_id", IntegerType(), False),
@@ -58,3 +51,60 @@ def file_schema() -> StructType:
             StructField("load_date", StringType(), False),
         ]
     )
+
+
+def arrow_file_schema():
+    """
+    Arrow counterpart of ```file_schema```.
+    """
+
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            pa.field("event_id", pa.int32(), nullable=False),
+            pa.field("title", pa.string(), nullable=False),
+            pa.field("host", pa.string()),
+            pa.field("start_date", pa.date32()),
+            pa.field("end_date", pa.date32()),
+            pa.field("start_time", pa.string()),
+            pa.field("end_time", pa.string()),
+            pa.field("event_description", pa.string()),
+            pa.field("location", pa.string()),
+            pa.field("external_link", pa.string()),
+            pa.field("record_source", pa.string(), nullable=False),
+            pa.field("load_date", pa.string(), nullable=False),
+        ]
+    )
+
+
+EVENT_FIELDS = tuple(field.name for field in fields(Event))
+
+
+class EventColumns:
+    """
+    Collects events as one list per column of ```file_schema```, so a batch
+    of events turns into an Arrow table without building a dict or Row per
+    event.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self) -> None:
+        self.columns: Dict[str, List[Any]] = {
+            name: [] for name in arrow_file_schema().names
+        }
+
+    def __len__(self) -> int:
+        return len(self.columns["event_id"])
+
+    def append(self, event: Event, record_source: str, load_date: str):
+        for name in EVENT_FIELDS:
+            self.columns[name].append(getattr(event, name))
+        self.columns["record_source"].append(record_source)
+        self.columns["load_date"].append(load_date)
+
+    def to_arrow(self):
+        import pyarrow as pa
+
+        return pa.Table.from_pydict(self.columns, schema=arrow_file_schema())
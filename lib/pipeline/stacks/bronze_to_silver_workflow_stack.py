@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 
-from aws_cdk import Duration, Stack
+from aws_cdk import Aws, Duration, Stack
 from aws_cdk import aws_glue as glue
 from aws_cdk import aws_iam as iam
 from aws_cdk import aws_lambda as _lambda
@@ -10,6 +10,8 @@ from aws_cdk import aws_stepfunctions as sf
 from aws_cdk import aws_stepfunctions_tasks as sf_tasks
 from aws_cdk.aws_s3 import IBucket
 
+from .function_code import function_code, light_etl_code
+
 
 @dataclass
 class BronzeToSilverWorkflowStackProps:
@@ -19,6 +21,11 @@ class BronzeToSilverWorkflowStackProps:
     silver_db_name: str
     scripts_bucket: IBucket
     notification_email: str
+    # "glue" always runs the Spark job. "auto" runs the transform in a
+    # container Lambda when the inline keys add up to at most light_max_bytes,
+    # and only falls back to Spark for bigger loads and manifests.
+    execution_mode: str = "glue"
+    light_max_bytes: int = 20 * 1024 * 1024
 
 
 class BronzeToSilverWorkflowStack(Stack):
@@ -34,6 +41,11 @@ class BronzeToSilverWorkflowStack(Stack):
             **kwargs,
         )
 
+        if props.execution_mode not in ("glue", "auto"):
+            raise ValueError(
+                f"Unknown execution_mode '{props.execution_mode}', expected 'glue' or 'auto'"
+            )
+
         pipeline_failure_topic = sns.Topic(
             self,
             "WorkflowFailureTopic",
@@ -85,7 +97,7 @@ class BronzeToSilverWorkflowStack(Stack):
         props.silver_bucket.grant_read(crawler_role)
 
         glue_job_name = f"{construct_id}-data-job"
-        glue.CfnJob(
+        glue_job = glue.CfnJob(
             scope=self,
             id="BronzeToSilverJob",
             name=glue_job_name,
@@ -93,7 +105,7 @@ class BronzeToSilverWorkflowStack(Stack):
             glue_version="5.1",
             worker_type="G.1X",
             number_of_workers=2,
-            timeout=10,
+            timeout=30,
             max_retries=0,
             execution_property=glue.CfnJob.ExecutionPropertyProperty(
                 max_concurrent_runs=5
@@ -104,27 +116,61 @@ class BronzeToSilverWorkflowStack(Stack):
             ),
             default_arguments={
                 "--TempDir": f"s3://{props.bronze_bucket.bucket_name}/bronze_to_silver/",
-                "--extra-py-files": f"s3://{props.scripts_bucket.bucket_name}/uc_types.py",
+                "--extra-py-files": ",".join(
+                    f"s3://{props.scripts_bucket.bucket_name}/{module}"
+                    for module in [
+                        "uc_types.py",
+                        "uc_dates.py",
+                        "uc_html.py",
+                        "uc_spark.py",
+                        "uc_transform.py",
+                        "uc_changes.py",
+                    ]
+                ),
                 "--continuous-log-logGroup": f"/aws-glue/jobs/{glue_job_name}",
                 "--enable-spark-ui": "true",
                 "--enable-metrics": "true",
                 "--enable-continuous-cloudwatch-log": "true",
-                "--additional-python-modules": "feedparser,beautifulsoup4,pyarrow",
+                "--additional-python-modules": "pyarrow",
+                "--datalake-formats": "iceberg",
                 "--SOURCE_BUCKET_NAME": props.bronze_bucket.bucket_name,
                 "--TARGET_BUCKET_NAME": props.silver_bucket.bucket_name,
+                "--SILVER_DATABASE_NAME": props.silver_db_name,
             },
         )
 
+        if props.execution_mode == "auto":
+            # Light loads only expire snapshots, so compaction and removing the
+            # files of expired snapshots run on a schedule instead
+            maintenance_trigger = glue.CfnTrigger(
+                scope=self,
+                id="SilverMaintenanceTrigger",
+                name=f"{construct_id}-silver-maintenance",
+                type="SCHEDULED",
+                schedule="cron(0 8 ? * SUN *)",
+                start_on_creation=True,
+                actions=[
+                    glue.CfnTrigger.ActionProperty(
+                        job_name=glue_job_name,
+                        arguments={"--MAINTENANCE_ONLY": "true"},
+                    )
+                ],
+            )
+            maintenance_trigger.add_dependency(glue_job)
+
         glue.CfnCrawler(
             scope=self,
             id="SilverCrawler",
             name=f"{construct_id}-silver-crawler",
             role=crawler_role.role_arn,
             database_name=props.silver_db_name,
+            # uc_events is an Iceberg table, crawling it as plain S3 would pick
+            # up data files of expired snapshots
             targets=glue.CfnCrawler.TargetsProperty(
-                s3_targets=[
-                    glue.CfnCrawler.S3TargetProperty(
-                        path=f"s3://{props.silver_bucket.bucket_name}/uc_events/",
+                iceberg_targets=[
+                    glue.CfnCrawler.IcebergTargetProperty(
+                        paths=[f"s3://{props.silver_bucket.bucket_name}/uc_events/"],
+                        maximum_traversal_depth=1,
                     )
                 ]
             ),
@@ -140,7 +186,10 @@ class BronzeToSilverWorkflowStack(Stack):
             runtime=_lambda.Runtime.PYTHON_3_12,
             handler="list_brz_files_fn.handler",
             timeout=Duration.seconds(30),
-            code=_lambda.Code.from_asset("lib/pipeline/functions"),
+            code=function_code("list_brz_files_fn"),
+            environment={
+                "MAX_INLINE_KEYS": "500",
+            },
         )
         list_files_fn.add_to_role_policy(
             iam.PolicyStatement(
@@ -149,6 +198,12 @@ class BronzeToSilverWorkflowStack(Stack):
                 conditions={"StringLike": {"s3:prefix": ["new/*"]}},
             )
         )
+        list_files_fn.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=["s3:PutObject"],
+                resources=[props.bronze_bucket.arn_for_objects("manifests/*")],
+            )
+        )
 
         list_files_task = sf_tasks.LambdaInvoke(
             scope=self,
@@ -161,15 +216,30 @@ class BronzeToSilverWorkflowStack(Stack):
             ),
         )
 
-        glue_task = sf_tasks.GlueStartJobRun(
-            scope=self,
-            id="RunDataGlueJob",
-            glue_job_name=glue_job_name,
-            integration_pattern=sf.IntegrationPattern.RUN_JOB,
-            timeout=Duration.minutes(10),
-            arguments=sf.TaskInput.from_object(
-                {"--UNPROCESSED_SOURCE_KEY": sf.JsonPath.string_at("$")}
-            ),
+        def glue_task(id: str, source_arguments: dict) -> sf_tasks.GlueStartJobRun:
+            return sf_tasks.GlueStartJobRun(
+                scope=self,
+                id=id,
+                glue_job_name=glue_job_name,
+                integration_pattern=sf.IntegrationPattern.RUN_JOB,
+                timeout=Duration.minutes(30),
+                arguments=sf.TaskInput.from_object(source_arguments),
+            )
+
+        # One job run processes every pending file, oldest first
+        process_files_task = glue_task(
+            "RunDataGlueJob",
+            {
+                "--SOURCE_KEYS": sf.JsonPath.json_to_string(
+                    sf.JsonPath.list_at("$.Payload.keys")
+                )
+            },
+        )
+
+        # Large backlogs come back as a manifest object instead of an inline list
+        process_manifest_task = glue_task(
+            "RunManifestDataGlueJob",
+            {"--SOURCE_KEYS_MANIFEST": sf.JsonPath.string_at("$.Payload.manifest_key")},
         )
 
         notify_success = sf_tasks.SnsPublish(
@@ -180,15 +250,12 @@ class BronzeToSilverWorkflowStack(Stack):
             message=sf.TaskInput.from_json_path_at("$"),
         )
 
-        process_files_map = sf.Map(
-            self,
-            "ProcessNewFilesMap",
-            items_path=sf.JsonPath.string_at("$.Payload"),
-            max_concurrency=1,
+        no_new_files = sf.Succeed(
+            scope=self,
+            id="NoNewFiles",
+            comment="Nothing under new/ to process.",
         )
 
-        process_files_map.iterator(glue_task)
-
         fail = sf.Fail(
             scope=self,
             id="BronzeToSilverFailed",
@@ -196,34 +263,62 @@ class BronzeToSilverWorkflowStack(Stack):
             error="ProcessError",
         )
 
-        definition = (
-            list_files_task.add_catch(
-                sf_tasks.SnsPublish(
-                    scope=self,
-                    id="NotifyListFilesFailure",
-                    topic=pipeline_failure_topic,
-                    subject="🚨 Campus Events Data Pipeline - Failed to list new files",
-                    message=sf.TaskInput.from_json_path_at("$.error"),
-                ).next(fail),
-                errors=["States.ALL"],
-                result_path="$.error",
+        def notify_job_failure(id: str) -> sf.IChainable:
+            return sf_tasks.SnsPublish(
+                scope=self,
+                id=id,
+                topic=pipeline_failure_topic,
+                subject="🚨 Campus Events Data Pipeline - Failed to process files",
+                message=sf.TaskInput.from_json_path_at("$.error"),
+            ).next(fail)
+
+        process_files_choice = (
+            sf.Choice(scope=self, id="HasNewFiles")
+            .when(sf.Condition.number_equals("$.Payload.count", 0), no_new_files)
+            .when(
+                sf.Condition.is_not_null("$.Payload.manifest_key"),
+                process_manifest_task.add_catch(
+                    notify_job_failure("NotifyManifestProcessingFailure"),
+                    errors=["States.ALL"],
+                    result_path="$.error",
+                ).next(notify_success),
             )
-            .next(
-                process_files_map.add_catch(
-                    sf_tasks.SnsPublish(
-                        scope=self,
-                        id="NotifyMapProcessingFailure",
-                        topic=pipeline_failure_topic,
-                        subject="🚨 Campus Events Data Pipeline - Failed to process files",
-                        message=sf.TaskInput.from_json_path_at("$.error"),
-                    ).next(fail),
+        )
+
+        if props.execution_mode == "auto":
+            process_files_choice.when(
+                sf.Condition.number_less_than_equals(
+                    "$.Payload.total_bytes", props.light_max_bytes
+                ),
+                self.light_transform_task(props)
+                .add_catch(
+                    notify_job_failure("NotifyLightProcessingFailure"),
                     errors=["States.ALL"],
                     result_path="$.error",
                 )
+                .next(notify_success),
             )
-            .next(notify_success)
+
+        process_files_choice.otherwise(
+            process_files_task.add_catch(
+                notify_job_failure("NotifyProcessingFailure"),
+                errors=["States.ALL"],
+                result_path="$.error",
+            ).next(notify_success)
         )
 
+        definition = list_files_task.add_catch(
+            sf_tasks.SnsPublish(
+                scope=self,
+                id="NotifyListFilesFailure",
+                topic=pipeline_failure_topic,
+                subject="🚨 Campus Events Data Pipeline - Failed to list new files",
+                message=sf.TaskInput.from_json_path_at("$.error"),
+            ).next(fail),
+            errors=["States.ALL"],
+            result_path="$.error",
+        ).next(process_files_choice)
+
         self.state_machine = sf.StateMachine(
             scope=self,
             id="BronzeToSilverStateMachine",
@@ -239,3 +334,52 @@ class BronzeToSilverWorkflowStack(Stack):
 
         # Grant Step Functions permission to read job results from S3
         props.silver_bucket.grant_read(self.state_machine)
+
+    def light_transform_task(
+        self, props: BronzeToSilverWorkflowStackProps
+    ) -> sf_tasks.LambdaInvoke:
+        """
+        Container Lambda that runs the bronze to silver transform with
+        pyarrow and pyiceberg instead of a Spark cluster.
+        """
+
+        light_fn = _lambda.DockerImageFunction(
+            scope=self,
+            id="LightTransformLambda",
+            code=light_etl_code("bronze_to_silver_light.handler"),
+            memory_size=3008,
+            timeout=Duration.minutes(15),
+            environment={
+                "SOURCE_BUCKET_NAME": props.bronze_bucket.bucket_name,
+                "TARGET_BUCKET_NAME": props.silver_bucket.bucket_name,
+                "SILVER_DATABASE_NAME": props.silver_db_name,
+            },
+        )
+        props.bronze_bucket.grant_read_write(light_fn)
+        props.silver_bucket.grant_read_write(light_fn)
+        light_fn.add_to_role_policy(
+            iam.PolicyStatement(
+                actions=[
+                    "glue:GetDatabase",
+                    "glue:GetTable",
+                    "glue:CreateTable",
+                    "glue:UpdateTable",
+                    "glue:DeleteTable",
+                ],
+                resources=[
+                    f"arn:{Aws.PARTITION}:glue:{Aws.REGION}:{Aws.ACCOUNT_ID}:catalog",
+                    f"arn:{Aws.PARTITION}:glue:{Aws.REGION}:{Aws.ACCOUNT_ID}:database/{props.silver_db_name}",
+                    f"arn:{Aws.PARTITION}:glue:{Aws.REGION}:{Aws.ACCOUNT_ID}:table/{props.silver_db_name}/*",
+                ],
+            )
+        )
+
+        return sf_tasks.LambdaInvoke(
+            scope=self,
+            id="RunLightTransform",
+            lambda_function=light_fn,
+            payload=sf.TaskInput.from_object(
+                {"keys": sf.JsonPath.list_at("$.Payload.keys")}
+            ),
+            task_timeout=sf.Timeout.duration(Duration.minutes(16)),
+        )
@@ -0,0 +1,38 @@
+"""
+Per-function Lambda bundles built from lib/pipeline/functions, and the
+container image of the lightweight ETL functions.
+"""
+
+from aws_cdk.aws_lambda import AssetCode, Code, DockerImageCode
+
+FUNCTIONS_DIR = "lib/pipeline/functions"
+
+# Helper modules every handler may import
+SHARED_MODULES = ["aws_clients.py"]
+
+
+def function_code(module_name: str) -> AssetCode:
+    """
+    Returns an asset holding only ```module_name``` and the shared helper
+    modules, instead of every handler in the directory.
+    """
+
+    included = [f"{module_name}.py", *SHARED_MODULES]
+    return Code.from_asset(
+        path=FUNCTIONS_DIR,
+        exclude=["*", *(f"!{file_name}" for file_name in included)],
+    )
+
+
+def light_etl_code(handler: str) -> DockerImageCode:
+    """
+    Returns the lightweight ETL image, built from lib/pipeline so it can copy
+    the shared scripts, started with ```handler```.
+    """
+
+    return DockerImageCode.from_image_asset(
+        directory="lib/pipeline",
+        file="containers/light_etl/Dockerfile",
+        cmd=[handler],
+        exclude=["functions", "stacks", "scripts/glue", "**/__pycache__"],
+    )
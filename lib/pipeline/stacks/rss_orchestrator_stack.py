@@ -1,15 +1,15 @@
 from dataclasses import dataclass
-import os
 
-from aws_cdk import Duration, Stack, aws_events
+from aws_cdk import Duration, Stack, aws_dynamodb, aws_events
 from aws_cdk import aws_events_targets as targets
 from aws_cdk import aws_logs as logs
 from aws_cdk import aws_stepfunctions as sf
 from aws_cdk import aws_stepfunctions_tasks as sf_tasks
-from aws_cdk.aws_lambda import Code, Function, Runtime
+from aws_cdk.aws_lambda import Function, Runtime
 from aws_cdk.aws_s3 import Bucket
 from constructs import Construct
 from lib.config import RssFeedConfig
+from .function_code import function_code
 
 
 @dataclass
@@ -18,6 +18,8 @@ class RssPipelineOrchestratorStackProps:
     bronze_bucket: Bucket
     bronze_to_silver_state_machine: sf.StateMachine
     silver_to_dynamo_state_machine: sf.StateMachine
+    events_table: aws_dynamodb.ITable
+    snapshots_bucket: Bucket
 
 
 class RssPipelineOrchestratorStack(Stack):
@@ -32,23 +34,23 @@ class RssPipelineOrchestratorStack(Stack):
             scope, construct_id, stack_name="CampusEventsPipelineOrchestrator", **kwargs
         )
 
-        lambda_dir = os.path.join("lib", "pipeline", "functions")
-
         get_rss_function = Function(
             scope=self,
             id="GetRssFeedLambda",
             function_name=f"{construct_id}-lambda-fn",
             runtime=Runtime.PYTHON_3_14,
             handler="rss_to_bronze_fn.handler",
-            code=Code.from_asset(path=lambda_dir),
+            code=function_code("rss_to_bronze_fn"),
             environment={
                 "RSS_FEED_URL": props.config.url,
                 "BRONZE_BUCKET_NAME": props.bronze_bucket.bucket_name,
+                "BRONZE_COMPRESSION": "gzip",
             },
             timeout=Duration.seconds(30),
         )
 
-        props.bronze_bucket.grant_write(get_rss_function)
+        # Read access is needed for the feed state object written by the previous run
+        props.bronze_bucket.grant_read_write(get_rss_function)
 
         get_rss_function_task = sf_tasks.LambdaInvoke(
             scope=self,
@@ -74,10 +76,60 @@ class RssPipelineOrchestratorStack(Stack):
             integration_pattern=sf.IntegrationPattern.RUN_JOB,
         )
 
-        main_chain = get_rss_function_task.next(bronze_to_silver_task).next(
-            silver_to_dynamo_task
+        publish_snapshots_function = Function(
+            scope=self,
+            id="PublishEventSnapshotsLambda",
+            function_name=f"{construct_id}-snapshots-fn",
+            runtime=Runtime.PYTHON_3_14,
+            handler="publish_event_snapshots_fn.handler",
+            code=function_code("publish_event_snapshots_fn"),
+            environment={
+                "TABLE_NAME": props.events_table.table_name,
+                "SNAPSHOTS_BUCKET_NAME": props.snapshots_bucket.bucket_name,
+                "SNAPSHOT_PREFIX": "snapshots/",
+                "SNAPSHOT_CACHE_CONTROL": "public, max-age=300",
+            },
+            memory_size=512,
+            timeout=Duration.minutes(5),
+        )
+
+        props.events_table.grant_read_data(publish_snapshots_function)
+        # Read access is needed to compare ETags before rewriting a snapshot
+        props.snapshots_bucket.grant_read_write(publish_snapshots_function)
+        props.snapshots_bucket.grant_delete(publish_snapshots_function)
+
+        publish_snapshots_task = sf_tasks.LambdaInvoke(
+            scope=self,
+            id="PublishEventSnapshotsTask",
+            lambda_function=publish_snapshots_function,
+            integration_pattern=sf.IntegrationPattern.REQUEST_RESPONSE,
+            timeout=Duration.minutes(6),
+        )
+
+        feed_unchanged = sf.Succeed(
+            scope=self,
+            id="FeedUnchanged",
+            comment="The RSS feed did not change since the last run, nothing to process.",
+        )
+
+        feed_changed_choice = (
+            sf.Choice(scope=self, id="FeedChanged")
+            .when(
+                sf.Condition.and_(
+                    sf.Condition.is_present("$.Payload.skipped"),
+                    sf.Condition.boolean_equals("$.Payload.skipped", True),
+                ),
+                feed_unchanged,
+            )
+            .otherwise(
+                bronze_to_silver_task.next(silver_to_dynamo_task).next(
+                    publish_snapshots_task
+                )
+            )
         )
 
+        main_chain = get_rss_function_task.next(feed_changed_choice)
+
         state_machine = sf.StateMachine(
             scope=self,
             id="RootStateMachine",
@@ -5,12 +5,14 @@ CDK stack defining the DynamoDB-backed ingestion workflow.
 from dataclasses import dataclass
 
 from aws_cdk import (
+    Aws,
     Duration,
     RemovalPolicy,
     Stack,
     aws_dynamodb,
     aws_glue,
     aws_iam,
+    aws_lambda,
     aws_sns,
     aws_sns_subscriptions,
 )
@@ -18,12 +20,21 @@ from aws_cdk import aws_stepfunctions as sf
 from aws_cdk import aws_stepfunctions_tasks as sf_tasks
 from aws_cdk.aws_s3 import IBucket
 
+from .function_code import function_code, light_etl_code
+
 
 @dataclass
 class SilverToDynamoEventsWorkflowStackProps:
     silver_bucket: IBucket
+    silver_db_name: str
     scripts_bucket: IBucket
     notification_email: str
+    # "glue" always syncs with the Spark job. "auto" syncs with the container
+    # Lambda while silver holds at most light_max_records rows and
+    # light_max_bytes of data files, and falls back to Spark above that.
+    execution_mode: str = "glue"
+    light_max_records: int = 100_000
+    light_max_bytes: int = 64 * 1024 * 1024
 
 
 class SilverToDynamoEventsWorkflowStack(Stack):
@@ -33,6 +44,10 @@ class SilverToDynamoEventsWorkflowStack(Stack):
 
     state_machine: sf.StateMachine
     events_table: aws_dynamodb.Table
+    # Silver bucket object the job rewrites after every load
+    load_marker_key: str = "_pipeline/last_dynamo_load.json"
+    # GSI over start_date / start_time used by the date range API
+    date_index_name: str = "DateIndex"
 
     def __init__(
         self,
@@ -48,6 +63,11 @@ class SilverToDynamoEventsWorkflowStack(Stack):
             **kwargs,
         )
 
+        if props.execution_mode not in ("glue", "auto"):
+            raise ValueError(
+                f"Unknown execution_mode '{props.execution_mode}', expected 'glue' or 'auto'"
+            )
+
         pipeline_failure_topic = aws_sns.Topic(
             self,
             "WorkflowFailureTopic",
@@ -107,7 +127,7 @@ class SilverToDynamoEventsWorkflowStack(Stack):
         )
 
         self.events_table.add_global_secondary_index(
-            index_name="DateIndex",
+            index_name=self.date_index_name,
             partition_key=aws_dynamodb.Attribute(
                 name="start_date", type=aws_dynamodb.AttributeType.STRING
             ),
@@ -137,13 +157,19 @@ class SilverToDynamoEventsWorkflowStack(Stack):
                 script_location=f"s3://{props.scripts_bucket.bucket_name}/glue/silver_to_dynamo_events.py",
             ),
             default_arguments={
-                "--extra-py-files": f"s3://{props.scripts_bucket.bucket_name}/uc_types.py",
+                "--extra-py-files": ",".join(
+                    f"s3://{props.scripts_bucket.bucket_name}/{module}"
+                    for module in ["uc_types.py", "uc_spark.py", "uc_dynamo.py"]
+                ),
+                "--datalake-formats": "iceberg",
                 "--SILVER_BUCKET_NAME": props.silver_bucket.bucket_name,
+                "--SILVER_DATABASE_NAME": props.silver_db_name,
                 "--DYNAMO_TABLE": dynamo_events_table_name,
+                "--LOAD_MARKER_KEY": self.load_marker_key,
             },
         )
 
-        glue_task = sf_tasks.GlueStartJobRun(
+        glue_sync_task = sf_tasks.GlueStartJobRun(
             scope=self,
             id="SilverToDynamoDbRunJob",
             glue_job_name=glue_job_name,
@@ -158,18 +184,53 @@ class SilverToDynamoEventsWorkflowStack(Stack):
             error="GlueJobError",
         )
 
-        definition = glue_task.add_catch(
-            sf_tasks.SnsPublish(
+        def notify_sync_failure(id: str) -> sf.IChainable:
+            return sf_tasks.SnsPublish(
                 scope=self,
-                id="NotifyDynamoGlueJobFailure",
+                id=id,
                 topic=pipeline_failure_topic,
                 subject="🚨 UC Events Data Pipeline - Failed to insert into DynamoDB",
                 message=sf.TaskInput.from_json_path_at("$.error"),
-            ).next(fail_state),
+            ).next(fail_state)
+
+        definition = glue_sync_task.add_catch(
+            notify_sync_failure("NotifyDynamoGlueJobFailure"),
             errors=["States.ALL"],
             result_path="$.error",
         ).next(notify_success)
 
+        if props.execution_mode == "auto":
+            sync_choice = (
+                sf.Choice(scope=self, id="IsSilverSmall")
+                .when(
+                    sf.Condition.and_(
+                        sf.Condition.number_less_than_equals(
+                            "$.Payload.total_records", props.light_max_records
+                        ),
+                        sf.Condition.number_less_than_equals(
+                            "$.Payload.total_bytes", props.light_max_bytes
+                        ),
+                    ),
+                    self.light_sync_task(props, dynamo_events_table_name)
+                    .add_catch(
+                        notify_sync_failure("NotifyDynamoLambdaFailure"),
+                        errors=["States.ALL"],
+                        result_path="$.error",
+                    )
+                    .next(notify_success),
+                )
+                .otherwise(definition)
+            )
+            definition = (
+                self.silver_size_task(props)
+                .add_catch(
+                    notify_sync_failure("NotifySilverSizeFailure"),
+                    errors=["States.ALL"],
+                    result_path="$.error",
+                )
+                .next(sync_choice)
+            )
+
         self.state_machine = sf.StateMachine(
             scope=self,
             id="SilverToDynamoDbStateMachine",
@@ -177,3 +238,78 @@ class SilverToDynamoEventsWorkflowStack(Stack):
             definition_body=sf.DefinitionBody.from_chainable(definition),
             timeout=Duration.minutes(5),
         )
+
+    def silver_size_task(
+        self, props: SilverToDynamoEventsWorkflowStackProps
+    ) -> sf_tasks.LambdaInvoke:
+        """
+        Reads the row count and size of silver from its Iceberg metadata.
+        """
+
+        size_fn = aws_lambda.Function(
+            scope=self,
+            id="SilverTableSizeLambda",
+            runtime=aws_lambda.Runtime.PYTHON_3_12,
+            handler="silver_table_size_fn.handler",
+            timeout=Duration.seconds(30),
+            code=function_code("silver_table_size_fn"),
+        )
+        props.silver_bucket.grant_read(size_fn, "uc_events/metadata/*")
+        size_fn.add_to_role_policy(
+            aws_iam.PolicyStatement(
+                actions=["glue:GetTable"],
+                resources=[
+                    f"arn:{Aws.PARTITION}:glue:{Aws.REGION}:{Aws.ACCOUNT_ID}:catalog",
+                    f"arn:{Aws.PARTITION}:glue:{Aws.REGION}:{Aws.ACCOUNT_ID}:database/{props.silver_db_name}",
+                    f"arn:{Aws.PARTITION}:glue:{Aws.REGION}:{Aws.ACCOUNT_ID}:table/{props.silver_db_name}/*",
+                ],
+            )
+        )
+
+        return sf_tasks.LambdaInvoke(
+            scope=self,
+            id="GetSilverTableSize",
+            lambda_function=size_fn,
+            payload=sf.TaskInput.from_object({"SILVER_DATABASE": props.silver_db_name}),
+        )
+
+    def light_sync_task(
+        self, props: SilverToDynamoEventsWorkflowStackProps, dynamo_table_name: str
+    ) -> sf_tasks.LambdaInvoke:
+        """
+        Container Lambda that runs the DynamoDB sync with pyiceberg instead of
+        a Spark cluster.
+        """
+
+        sync_fn = aws_lambda.DockerImageFunction(
+            scope=self,
+            id="SilverToDynamoLightLambda",
+            code=light_etl_code("silver_to_dynamo_light.handler"),
+            memory_size=2048,
+            timeout=Duration.minutes(5),
+            environment={
+                "DYNAMO_TABLE": dynamo_table_name,
+                "SILVER_DATABASE_NAME": props.silver_db_name,
+                "SILVER_BUCKET_NAME": props.silver_bucket.bucket_name,
+                "LOAD_MARKER_KEY": self.load_marker_key,
+            },
+        )
+        self.events_table.grant_read_write_data(sync_fn)
+        props.silver_bucket.grant_read_write(sync_fn)
+        sync_fn.add_to_role_policy(
+            aws_iam.PolicyStatement(
+                actions=["glue:GetDatabase", "glue:GetTable"],
+                resources=[
+                    f"arn:{Aws.PARTITION}:glue:{Aws.REGION}:{Aws.ACCOUNT_ID}:catalog",
+                    f"arn:{Aws.PARTITION}:glue:{Aws.REGION}:{Aws.ACCOUNT_ID}:database/{props.silver_db_name}",
+                    f"arn:{Aws.PARTITION}:glue:{Aws.REGION}:{Aws.ACCOUNT_ID}:table/{props.silver_db_name}/*",
+                ],
+            )
+        )
+
+        return sf_tasks.LambdaInvoke(
+            scope=self,
+            id="SilverToDynamoDbRunLambda",
+            lambda_function=sync_fn,
+            task_timeout=sf.Timeout.duration(Duration.minutes(5)),
+        )
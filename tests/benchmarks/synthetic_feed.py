@@ -0,0 +1,173 @@
+"""
+Synthetic Campus Labs Engage feeds for the benchmarks.
+
+The items follow the layout of ```tests/fixtures/events_20251211_060736.xml```:
+an hCalendar description wrapped in CDATA, categories, the ```events```
+namespace start/end/location/status/host elements and a GUID ending in the
+event id. Feeds are generated from a seed, so every run parses the same bytes.
+"""
+
+import random
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from html import escape
+from typing import List, Tuple
+
+FEED_DATE = datetime(2025, 12, 11, 6, 7, 35, tzinfo=timezone.utc)
+
+TITLE_WORDS = [
+    "Aero",
+    "Sub-Team",
+    "Meeting",
+    "General",
+    "Workshop",
+    "Study",
+    "Night",
+    "Career",
+    "Fair",
+    "Info",
+    "Session",
+    "Bearcats",
+    "Volunteer",
+    "Café",
+    "Open",
+    "Mic",
+]
+HOSTS = [
+    "Bearcats Motorsports at the University of Cincinnati",
+    "Undergraduate Student Government",
+    "Career Education",
+    "Résidence Hall Association",
+    "Cincinnati Programming Board",
+    None,
+]
+LOCATIONS = [
+    "Old Chem 685",
+    "Rhodes 407/440C",
+    "Tangeman University Center – Great Hall",
+    "Nippert Stadium",
+    "Online",
+    "",
+]
+CATEGORIES = [
+    "ThoughtfulLearning",
+    "Club Sports Competition",
+    "Campus Event",
+    "Leadership Development",
+    "Training",
+    "Workshop",
+]
+SENTENCES = [
+    "Each week the team will be meeting on Thursdays from 5-6pm.&nbsp;",
+    "Bring a laptop &amp; your student ID.",
+    "Pizza will be provided while supplies last!",
+    "Registration closes <strong>two days</strong> before the event.",
+    "Questions? Email the organizers at <a href='mailto:x@uc.edu'>x@uc.edu</a>.",
+]
+
+CHANNEL_HEADER = """<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0">
+  <channel>
+    <title>University of Cincinnati Public Events</title>
+    <description>A listing of public events for University of Cincinnati.</description>
+    <language>en-us</language>
+    <lastBuildDate>{build_date}</lastBuildDate>
+    <category>Public Events</category>
+    <generator>Campus Labs Engage</generator>
+    <ttl>300</ttl>
+    <pubDate>{build_date}</pubDate>
+    <link>https://campuslink.uc.edu/events</link>
+"""
+
+CHANNEL_FOOTER = """  </channel>
+</rss>
+"""
+
+
+def description(rng: random.Random, title: str, location: str) -> str:
+    paragraphs = "".join(
+        f"<p>{' '.join(rng.sample(SENTENCES, rng.randint(1, 3)))}</p>"
+        for _ in range(rng.randint(1, 3))
+    )
+    if rng.random() < 0.3:
+        items = "".join(f"<li>{word}</li>" for word in rng.sample(TITLE_WORDS, 3))
+        paragraphs += f"<ul>{items}</ul>"
+    return f"""<div class="h-event vevent">
+  <div class="p-name summary">{title}</div>
+  <div class="p-description description">{paragraphs}</div>
+  <div>
+    <p>
+      From <time class="dt-start dtstart">Thursday, December 11, 2025 5:00 PM</time>
+      to <time class="dt-end dtend">6:00 PM EST</time>
+      at <span class="p-location location">{location}</span>.
+    </p>
+  </div>
+</div>"""
+
+
+def synthetic_item(rng: random.Random, event_id: int) -> str:
+    title = " ".join(rng.sample(TITLE_WORDS, rng.randint(2, 5)))
+    host = rng.choice(HOSTS)
+    location = rng.choice(LOCATIONS)
+    start = FEED_DATE.replace(hour=0, minute=0, second=0) + timedelta(
+        days=rng.randint(0, 90),
+        hours=rng.randint(0, 23),
+        minutes=15 * rng.randint(0, 3),
+    )
+    end = start + timedelta(minutes=30 * rng.randint(1, 8))
+    categories = "".join(
+        f"\n      <category>{category}</category>"
+        for category in rng.sample(CATEGORIES, rng.randint(1, 4))
+    )
+    host_element = f'\n      <host xmlns="events">{escape(host)}</host>' if host else ""
+    link = f"https://campuslink.uc.edu/event/{event_id}"
+    return f"""    <item>
+      <title>{escape(title)}</title>
+      <guid>{link}</guid>
+      <link>{link}</link>
+      <enclosure url="https://se-images.campuslabs.com/clink/images/{event_id}.png?preset=med-w" length="1" type="image/jpeg" />
+      <description><![CDATA[{description(rng, title, location)}]]></description>{categories}
+      <pubDate>{format_datetime(FEED_DATE, usegmt=True)}</pubDate>
+      <start xmlns="events">{format_datetime(start, usegmt=True)}</start>
+      <end xmlns="events">{format_datetime(end, usegmt=True)}</end>
+      <location xmlns="events">{escape(location)}</location>
+      <status xmlns="events">confirmed</status>
+      <author>test@ucmail.uc.edu ({escape(host or "Campus Labs")})</author>{host_element}
+    </item>
+"""
+
+
+def synthetic_feed(
+    item_count: int, seed: int = 0, first_event_id: int = 11_000_000
+) -> str:
+    """
+    Returns a feed of ```item_count``` items with consecutive event ids
+    starting at ```first_event_id```.
+    """
+
+    rng = random.Random(seed)
+    items = [
+        synthetic_item(rng, event_id)
+        for event_id in range(first_event_id, first_event_id + item_count)
+    ]
+    build_date = format_datetime(FEED_DATE, usegmt=True)
+    return (
+        CHANNEL_HEADER.format(build_date=build_date) + "".join(items) + CHANNEL_FOOTER
+    )
+
+
+def synthetic_sources(item_count: int, seed: int = 0) -> List[Tuple[str, str]]:
+    """
+    Returns two consecutive feeds as ```(s3_key, xml)```, oldest first. The
+    newer one drops the first tenth of the events, adds as many new ones and
+    regenerates the rest with another seed, the way a day of edits would.
+    """
+
+    dropped = item_count // 10
+    return [
+        ("new/events_20251211_060736.xml", synthetic_feed(item_count, seed)),
+        (
+            "new/events_20251212_060736.xml",
+            synthetic_feed(item_count, seed + 1, 11_000_000 + dropped),
+        ),
+    ]
@@ -0,0 +1,86 @@
+"""
+Cold start budget for the Lambda handlers.
+
+Each handler module is imported in a fresh interpreter with ```-X importtime```,
+which is what a cold start pays before the first invocation. The test fails when
+a module takes longer than its budget or pulls in boto3 at import time. Only
+runs with ```pytest --benchmark```.
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+FUNCTIONS_DIR = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, "lib", "pipeline", "functions"
+)
+
+# Cumulative import time allowed per handler module, in milliseconds
+IMPORT_BUDGET_MS = {
+    "rss_to_bronze_fn": 150,
+    "list_brz_files_fn": 100,
+    "api_get_event_names": 100,
+    "api_get_events_by_date": 100,
+    "publish_event_snapshots_fn": 100,
+    "silver_table_size_fn": 100,
+}
+
+# Imported on first use through aws_clients, never when the handler loads
+LAZY_MODULES = ["boto3", "botocore"]
+
+# Best of a few runs, to keep a busy machine from failing the budget
+RUNS = 5
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s*(\S+)$")
+
+
+def import_module(module_name: str):
+    """
+    Imports ```module_name``` in a new interpreter and returns its cumulative
+    import time in milliseconds and the modules loaded afterwards.
+    """
+
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys, {module_name}; print('\\n'.join(sys.modules))",
+        ],
+        cwd=FUNCTIONS_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative_us = None
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match and match.group(3) == module_name:
+            cumulative_us = int(match.group(2))
+    assert cumulative_us is not None, result.stderr
+
+    return cumulative_us / 1000, set(result.stdout.split())
+
+
+@pytest.mark.parametrize("module_name", sorted(IMPORT_BUDGET_MS))
+def test_handler_import_within_budget(module_name):
+    timings = []
+    for _ in range(RUNS):
+        import_ms, modules = import_module(module_name)
+        timings.append(import_ms)
+
+    loaded = [name for name in LAZY_MODULES if name in modules]
+    assert not loaded, f"{module_name} imports {loaded} at load time"
+
+    best_ms = min(timings)
+    print(
+        f"{module_name}: {best_ms:.1f} ms (budget {IMPORT_BUDGET_MS[module_name]} ms)"
+    )
+    assert best_ms <= IMPORT_BUDGET_MS[module_name]
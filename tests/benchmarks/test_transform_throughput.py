@@ -0,0 +1,164 @@
+"""
+Throughput and peak memory of the bronze to silver transform on synthetic feeds.
+
+Each stage runs once timed and once under ```tracemalloc```, which slows code
+down too much to time it at the same run. The stages mirror the Glue job:
+
+- ```parse_rss```: ```iter_feed_items``` streaming the feed, as the job does
+- ```extract_description```: the description HTML to text step alone
+- ```events_to_dataframe```: ```EventColumns``` to Arrow to pandas, everything
+  the job does before handing the data to Spark
+- ```dedup```: ```latest_events``` over two overlapping files
+
+The test fails when a stage is slower or uses more memory per item than its
+budget. When ```UC_BENCH_RESULTS``` names a file, every measurement is
+appended to it so runs can be compared over time.
+
+Only runs with ```pytest --benchmark```. Only 1k items run by default, since
+generating the big feeds alone takes minutes. Set
+```UC_BENCH_SIZES=1000,10000,100000,500000``` for the full suite.
+"""
+
+import io
+import json
+import os
+import platform
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Callable, Dict, List, Tuple
+
+import pytest
+
+from tests.benchmarks.synthetic_feed import synthetic_sources
+from uc_transform import (
+    extract_description,
+    item_entry,
+    iter_feed_items,
+    latest_events,
+)
+from uc_types import Event, EventColumns
+
+pytestmark = pytest.mark.benchmark
+
+RESULTS_PATH = os.environ.get("UC_BENCH_RESULTS")
+
+SIZES = [int(size) for size in os.environ.get("UC_BENCH_SIZES", "1000").split(",")]
+
+# Minimum items per second and maximum traced peak per item, in bytes.
+# Set at about a fifth of the speed and twice the memory of a laptop run.
+BUDGETS: Dict[str, Tuple[int, int]] = {
+    "parse_rss": (1_000, 4 * 1024),
+    "extract_description": (2_000, 1024),
+    "events_to_dataframe": (25_000, 1024),
+    "dedup": (1_000_000, 512),
+}
+
+LOAD_DATE = "2025-12-12T00:00:00+00:00"
+
+
+@lru_cache(maxsize=1)
+def prepared(item_count: int):
+    """
+    Returns the feeds, the parsed entries and the events of both files, so
+    each stage only measures itself.
+    """
+
+    sources = [(key, xml.encode("utf-8")) for key, xml in synthetic_sources(item_count)]
+    _, newest = sources[-1]
+    entries = [item_entry(item) for item in ET.fromstring(newest).iter("item")]
+    events_by_key = [(key, feed_events(feed)) for key, feed in sources]
+    return sources, entries, events_by_key
+
+
+def feed_events(feed: bytes) -> List[Event]:
+    return [item.event for item in iter_feed_items(io.BytesIO(feed))]
+
+
+def events_to_arrow(events_by_key: List[Tuple[str, List[Event]]]):
+    columns = EventColumns()
+    for s3_key, events in events_by_key:
+        record_source = s3_key.rsplit("/", 1)[-1]
+        for event in events:
+            columns.append(event, record_source=record_source, load_date=LOAD_DATE)
+    return columns.to_arrow().to_pandas()
+
+
+def stage(name: str, item_count: int) -> Tuple[int, Callable[[], object]]:
+    """
+    Returns the number of items the stage handles and a function running it.
+    """
+
+    sources, entries, events_by_key = prepared(item_count)
+    if name == "parse_rss":
+        _, feed = sources[-1]
+        return item_count, lambda: feed_events(feed)
+    if name == "extract_description":
+        return item_count, lambda: [extract_description(e) for e in entries]
+    if name == "events_to_dataframe":
+        pytest.importorskip("pandas")
+        pytest.importorskip("pyarrow")
+        return 2 * item_count, lambda: events_to_arrow(events_by_key)
+    if name == "dedup":
+        return 2 * item_count, lambda: latest_events(events_by_key)
+    raise ValueError(f"Unknown stage '{name}'")
+
+
+def measure(run: Callable[[], object]) -> Tuple[float, int]:
+    """
+    Returns the wall time of ```run``` in seconds and its traced peak memory
+    in bytes.
+    """
+
+    started = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak_bytes
+
+
+def record(result: dict) -> None:
+    if not RESULTS_PATH:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(RESULTS_PATH)), exist_ok=True)
+    with open(RESULTS_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result) + "\n")
+
+
+# Sizes outermost, so each feed is generated and parsed only once
+@pytest.mark.parametrize("stage_name", list(BUDGETS))
+@pytest.mark.parametrize("item_count", SIZES)
+def test_stage_within_budget(stage_name, item_count):
+    items, run = stage(stage_name, item_count)
+    seconds, peak_bytes = measure(run)
+
+    items_per_second = items / seconds
+    peak_bytes_per_item = peak_bytes / items
+    record(
+        {
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "stage": stage_name,
+            "feed_items": item_count,
+            "items": items,
+            "seconds": round(seconds, 4),
+            "items_per_second": round(items_per_second),
+            "peak_bytes": peak_bytes,
+        }
+    )
+
+    min_items_per_second, max_bytes_per_item = BUDGETS[stage_name]
+    print(
+        f"{stage_name} x{item_count}: {items_per_second:,.0f} items/s, "
+        f"peak {peak_bytes / 2**20:.1f} MiB"
+    )
+    assert items_per_second >= min_items_per_second
+    assert peak_bytes_per_item <= max_bytes_per_item
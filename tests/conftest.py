@@ -0,0 +1,33 @@
+import os
+import sys
+
+# Glue ships lib/pipeline/scripts through --extra-py-files, so the scripts
+# import those modules top level. Mirror that for the tests.
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), os.pardir, "lib", "pipeline", "scripts")
+)
+
+# The Lambda bundles put each handler next to aws_clients, the same way
+sys.path.insert(
+    0,
+    os.path.join(os.path.dirname(__file__), os.pardir, "lib", "pipeline", "functions"),
+)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        help="Also run the tests marked benchmark, which are deselected by default",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+
+    # Their budgets depend on the machine, so plain runs leave them out
+    deselected = [item for item in items if item.get_closest_marker("benchmark")]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if not item.get_closest_marker("benchmark")]
@@ -0,0 +1,202 @@
+import hashlib
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import api_get_event_names
+import aws_clients
+from api_get_event_names import etag_matches, lambda_handler
+
+
+class ClientError(Exception):
+    def __init__(self, code: str):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+class FakeS3:
+    exceptions = SimpleNamespace(ClientError=ClientError)
+
+    def __init__(self, marker_etag=None):
+        self.marker_etag = marker_etag
+        self.heads = 0
+
+    def head_object(self, Bucket, Key):
+        self.heads += 1
+        if self.marker_etag is None:
+            raise ClientError("404")
+        return {"ETag": self.marker_etag}
+
+
+class FakePaginator:
+    def __init__(self, dynamodb):
+        self.dynamodb = dynamodb
+
+    def paginate(self, **kwargs):
+        self.dynamodb.scans.append(kwargs)
+        # One page per title, like a scan past the 1 MB page limit
+        return [{"Items": [{"title": {"S": title}}]} for title in self.dynamodb.titles]
+
+
+class FakeDynamoDB:
+    def __init__(self, titles):
+        self.titles = titles
+        self.scans = []
+
+    def get_paginator(self, name):
+        assert name == "scan"
+        return FakePaginator(self)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(api_get_event_names.time, "monotonic", clock)
+    monkeypatch.setattr(
+        api_get_event_names,
+        "_cache",
+        {"marker": None, "checked_at": 0.0, "body": None, "etag": None},
+    )
+    monkeypatch.setenv("TABLE_NAME", "events")
+    monkeypatch.setenv("MARKER_BUCKET_NAME", "silver")
+    monkeypatch.setenv("MARKER_KEY", "_pipeline/last_dynamo_load.json")
+    monkeypatch.setenv("CACHE_TTL_SECONDS", "60")
+    return clock
+
+
+def install(monkeypatch, s3, dynamodb):
+    monkeypatch.setitem(aws_clients._clients, "s3", s3)
+    monkeypatch.setitem(aws_clients._clients, "dynamodb", dynamodb)
+
+
+def test_titles_are_scanned_with_a_projection(clock, monkeypatch):
+    dynamodb = FakeDynamoDB(["Concert", "Lecture"])
+    install(monkeypatch, FakeS3('"m1"'), dynamodb)
+
+    response = lambda_handler({}, None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == ["Concert", "Lecture"]
+    assert dynamodb.scans == [
+        {
+            "TableName": "events",
+            "ProjectionExpression": "#title",
+            "ExpressionAttributeNames": {"#title": "title"},
+        }
+    ]
+
+
+def test_cache_answers_without_aws_calls_within_the_ttl(clock, monkeypatch):
+    s3 = FakeS3('"m1"')
+    dynamodb = FakeDynamoDB(["Concert"])
+    install(monkeypatch, s3, dynamodb)
+
+    lambda_handler({}, None)
+    clock.now += 59
+    dynamodb.titles = ["Changed"]
+    response = lambda_handler({}, None)
+
+    assert json.loads(response["body"]) == ["Concert"]
+    assert s3.heads == 1
+    assert len(dynamodb.scans) == 1
+
+
+def test_cache_is_kept_while_the_marker_is_unchanged(clock, monkeypatch):
+    s3 = FakeS3('"m1"')
+    dynamodb = FakeDynamoDB(["Concert"])
+    install(monkeypatch, s3, dynamodb)
+
+    lambda_handler({}, None)
+    clock.now += 61
+    lambda_handler({}, None)
+
+    # Past the TTL the marker is checked again, but the titles are not rescanned
+    assert s3.heads == 2
+    assert len(dynamodb.scans) == 1
+
+
+def test_new_load_marker_invalidates_the_cache(clock, monkeypatch):
+    s3 = FakeS3('"m1"')
+    dynamodb = FakeDynamoDB(["Concert"])
+    install(monkeypatch, s3, dynamodb)
+
+    lambda_handler({}, None)
+    clock.now += 61
+    s3.marker_etag = '"m2"'
+    dynamodb.titles = ["Concert", "Lecture"]
+    response = lambda_handler({}, None)
+
+    assert json.loads(response["body"]) == ["Concert", "Lecture"]
+    assert len(dynamodb.scans) == 2
+
+
+def test_missing_marker_always_rescans(clock, monkeypatch):
+    dynamodb = FakeDynamoDB(["Concert"])
+    install(monkeypatch, FakeS3(), dynamodb)
+
+    lambda_handler({}, None)
+    clock.now += 61
+    lambda_handler({}, None)
+
+    assert len(dynamodb.scans) == 2
+
+
+def test_etag_is_the_sha256_of_the_body(clock, monkeypatch):
+    install(monkeypatch, FakeS3('"m1"'), FakeDynamoDB(["Concert"]))
+
+    response = lambda_handler({}, None)
+
+    digest = hashlib.sha256(response["body"].encode("utf-8")).hexdigest()
+    assert response["headers"]["ETag"] == f'"{digest[:32]}"'
+    assert response["headers"]["Cache-Control"] == "public, max-age=300"
+
+
+def test_etag_only_changes_with_the_titles(clock, monkeypatch):
+    s3 = FakeS3('"m1"')
+    install(monkeypatch, s3, FakeDynamoDB(["Concert"]))
+
+    first = lambda_handler({}, None)
+    clock.now += 61
+    # A load that rewrote the marker without changing any title
+    s3.marker_etag = '"m2"'
+    second = lambda_handler({}, None)
+
+    assert second["headers"]["ETag"] == first["headers"]["ETag"]
+
+
+def test_matching_if_none_match_gets_an_empty_304(clock, monkeypatch):
+    install(monkeypatch, FakeS3('"m1"'), FakeDynamoDB(["Concert"]))
+    etag = lambda_handler({}, None)["headers"]["ETag"]
+
+    # API Gateway passes the header with the client's capitalization
+    response = lambda_handler({"headers": {"if-none-match": etag}}, None)
+
+    assert response["statusCode"] == 304
+    assert response["body"] == ""
+    assert response["headers"]["ETag"] == etag
+
+
+def test_stale_if_none_match_gets_the_body(clock, monkeypatch):
+    install(monkeypatch, FakeS3('"m1"'), FakeDynamoDB(["Concert"]))
+
+    response = lambda_handler({"headers": {"If-None-Match": '"stale"'}}, None)
+
+    assert response["statusCode"] == 200
+    assert json.loads(response["body"]) == ["Concert"]
+
+
+def test_etag_matches_uses_the_weak_comparison():
+    assert etag_matches('W/"abc"', '"abc"')
+    assert etag_matches('"x", "abc"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches(None, '"abc"')
+    assert not etag_matches('"abcd"', '"abc"')
@@ -0,0 +1,203 @@
+import base64
+import json
+from datetime import date, timedelta
+
+import pytest
+
+import aws_clients
+from api_get_events_by_date import MAX_RANGE_DAYS, encode_cursor, lambda_handler
+
+
+class FakeDynamoDB:
+    """
+    Answers Query on the DateIndex from a list of events, with the paging
+    DynamoDB does: at most ```Limit``` items, and a LastEvaluatedKey whenever
+    the page is full.
+    """
+
+    def __init__(self, events):
+        self.events = events
+        self.queries = []
+
+    def query(self, **kwargs):
+        self.queries.append(kwargs)
+        day = kwargs["ExpressionAttributeValues"][":day"]["S"]
+        items = sorted(
+            (
+                {
+                    "event_id": {"N": str(event["event_id"])},
+                    "start_date": {"S": event["start_date"]},
+                    "start_time": {"S": event["start_time"]},
+                    "title": {"S": event["title"]},
+                }
+                for event in self.events
+                if event["start_date"] == day
+            ),
+            key=lambda item: (item["start_time"]["S"], item["event_id"]["N"]),
+        )
+        start_key = kwargs.get("ExclusiveStartKey")
+        if start_key:
+            position = next(
+                i
+                for i, item in enumerate(items)
+                if all(item[name] == start_key[name] for name in start_key)
+            )
+            items = items[position + 1 :]
+        page = items[: kwargs["Limit"]]
+        response = {"Items": page}
+        if len(page) == kwargs["Limit"]:
+            last = page[-1]
+            response["LastEvaluatedKey"] = {
+                name: last[name] for name in ("event_id", "start_date", "start_time")
+            }
+        return response
+
+
+def event(event_id: int, start_date: str, start_time: str) -> dict:
+    return {
+        "event_id": event_id,
+        "start_date": start_date,
+        "start_time": start_time,
+        "title": f"Event {event_id}",
+    }
+
+
+EVENTS = [
+    event(1, "2025-12-01", "09:00:00"),
+    event(2, "2025-12-01", "12:00:00"),
+    event(3, "2025-12-01", "18:00:00"),
+    event(4, "2025-12-03", "08:00:00"),
+    event(5, "2025-12-04", "10:00:00"),
+]
+
+
+@pytest.fixture
+def dynamodb(monkeypatch):
+    monkeypatch.setenv("TABLE_NAME", "events")
+    monkeypatch.setenv("DATE_INDEX_NAME", "DateIndex")
+    fake = FakeDynamoDB(EVENTS)
+    monkeypatch.setitem(aws_clients._clients, "dynamodb", fake)
+    return fake
+
+
+def get(**params):
+    response = lambda_handler({"queryStringParameters": params}, None)
+    return response["statusCode"], json.loads(response["body"])
+
+
+def forged_cursor(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode("utf-8")).decode()
+
+
+def test_cursor_pages_through_range_in_start_order(dynamodb):
+    params = {"from": "2025-12-01", "to": "2025-12-04", "limit": "2"}
+    pages = []
+    while True:
+        status, body = get(**params)
+        assert status == 200
+        pages.append([e["event_id"] for e in body["events"]])
+        if not body["cursor"]:
+            break
+        params["cursor"] = body["cursor"]
+
+    assert pages == [[1, 2], [3, 4], [5]]
+
+
+def test_page_ending_mid_day_resumes_after_last_event(dynamodb):
+    status, body = get(**{"from": "2025-12-01", "to": "2025-12-01", "limit": "1"})
+    assert status == 200
+    assert [e["event_id"] for e in body["events"]] == [1]
+    assert isinstance(body["events"][0]["event_id"], int)
+
+    status, body = get(
+        **{"from": "2025-12-01", "to": "2025-12-01", "cursor": body["cursor"]}
+    )
+    assert [e["event_id"] for e in body["events"]] == [2, 3]
+    assert body["cursor"] is None
+    assert dynamodb.queries[-1]["ExclusiveStartKey"] == {
+        "event_id": {"N": "1"},
+        "start_date": {"S": "2025-12-01"},
+        "start_time": {"S": "09:00:00"},
+    }
+
+
+def test_full_page_at_end_of_day_continues_on_next_date(dynamodb):
+    status, body = get(**{"from": "2025-12-01", "to": "2025-12-04", "limit": "3"})
+    assert [e["event_id"] for e in body["events"]] == [1, 2, 3]
+
+    status, body = get(
+        **{"from": "2025-12-01", "to": "2025-12-04", "cursor": body["cursor"]}
+    )
+    assert [e["event_id"] for e in body["events"]] == [4, 5]
+
+
+def test_range_longer_than_cap_is_rejected(dynamodb):
+    to_date = date(2025, 12, 1) + timedelta(days=MAX_RANGE_DAYS)
+    status, _ = get(**{"from": "2025-12-01", "to": to_date.isoformat()})
+    assert status == 400
+    assert dynamodb.queries == []
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        # Before 'from', which would widen the range past the cap
+        encode_cursor(date(1990, 1, 1), None),
+        # After 'to'
+        encode_cursor(date(2025, 12, 3), None),
+        forged_cursor({"d": "2025-12-01", "k": "event_id"}),
+        forged_cursor({"d": "2025-12-01", "k": ["event_id"]}),
+        forged_cursor({"d": "2025-12-01", "k": {"event_id": {"N": "1"}}}),
+        forged_cursor(
+            {
+                "d": "2025-12-01",
+                "k": {
+                    "event_id": {"N": "1"},
+                    "start_date": {"S": "2025-12-01"},
+                    "start_time": {"S": "09:00:00"},
+                    "title": {"S": "Event 1"},
+                },
+            }
+        ),
+        forged_cursor(
+            {
+                "d": "2025-12-01",
+                "k": {
+                    "event_id": {"N": 1},
+                    "start_date": {"S": "2025-12-01"},
+                    "start_time": {"S": "09:00:00"},
+                },
+            }
+        ),
+        # Key on another date than the one queried
+        forged_cursor(
+            {
+                "d": "2025-12-01",
+                "k": {
+                    "event_id": {"N": "4"},
+                    "start_date": {"S": "2025-12-03"},
+                    "start_time": {"S": "08:00:00"},
+                },
+            }
+        ),
+        forged_cursor({"d": "2025-12-01"}),
+        "not base64 json",
+    ],
+    ids=[
+        "before-from",
+        "after-to",
+        "key-string",
+        "key-list",
+        "key-missing-attributes",
+        "key-extra-attribute",
+        "key-number-not-string",
+        "key-other-date",
+        "no-key",
+        "not-base64",
+    ],
+)
+def test_invalid_cursor_is_rejected(dynamodb, cursor):
+    status, body = get(**{"from": "2025-12-01", "to": "2025-12-02", "cursor": cursor})
+    assert status == 400
+    assert "cursor" in body["error"]
+    assert dynamodb.queries == []
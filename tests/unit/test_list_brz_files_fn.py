@@ -0,0 +1,76 @@
+import json
+
+import aws_clients
+from list_brz_files_fn import BRONZE_KEY_TIMESTAMP, handler, key_timestamp
+from uc_transform import sort_source_keys, source_key_timestamp_pattern
+
+KEYS = [
+    "new/events_20251212_060736.xml.gz",
+    "new/notes.xml",
+    "new/events_20251210_063602.xml",
+    "new/events_20251211_060736.xml.gz",
+]
+
+
+class FakePaginator:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def paginate(self, Bucket, Prefix):
+        return iter(self.pages)
+
+
+class FakeS3:
+    def __init__(self, pages):
+        self.pages = pages
+        self.objects = {}
+
+    def get_paginator(self, name):
+        assert name == "list_objects_v2"
+        return FakePaginator(self.pages)
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[(Bucket, Key)] = Body
+
+
+def test_key_order_matches_the_transform():
+    # The Lambda bundle can't import uc_transform, so it keeps its own copy.
+    # The Glue job and the light Lambda sort the keys again with uc_transform,
+    # both orders have to agree.
+    assert BRONZE_KEY_TIMESTAMP.pattern == source_key_timestamp_pattern.pattern
+    assert sorted(KEYS, key=lambda key: (key_timestamp(key), key)) == (
+        sort_source_keys(KEYS)
+    )
+
+
+def test_handler_lists_feeds_oldest_first(monkeypatch):
+    s3 = FakeS3(
+        [
+            {"Contents": [{"Key": key, "Size": 10} for key in KEYS[:2]]},
+            {"Contents": [{"Key": key, "Size": 10} for key in KEYS[2:]]},
+            # Empty prefixes come back without Contents
+            {},
+        ]
+    )
+    monkeypatch.setitem(aws_clients._clients, "s3", s3)
+
+    result = handler({"BRONZE_BUCKET": "bronze"}, None)
+
+    assert result == {
+        "count": 4,
+        "total_bytes": 40,
+        "keys": sort_source_keys(KEYS),
+        "manifest_key": None,
+    }
+
+
+def test_handler_writes_a_manifest_for_large_backlogs(monkeypatch):
+    s3 = FakeS3([{"Contents": [{"Key": key, "Size": 10} for key in KEYS]}])
+    monkeypatch.setitem(aws_clients._clients, "s3", s3)
+    monkeypatch.setenv("MAX_INLINE_KEYS", "2")
+
+    result = handler({"BRONZE_BUCKET": "bronze"}, None)
+
+    assert result["keys"] == []
+    manifest = s3.objects[("bronze", result["manifest_key"])]
+    assert json.loads(manifest) == sort_source_keys(KEYS)
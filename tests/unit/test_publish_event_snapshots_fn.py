@@ -0,0 +1,146 @@
+import gzip
+import hashlib
+import json
+
+import pytest
+
+import aws_clients
+import publish_event_snapshots_fn
+from publish_event_snapshots_fn import handler, snapshot_body
+
+
+class FakePaginator:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def paginate(self, **kwargs):
+        return self.pages()
+
+
+class FakeDynamoDB:
+    def __init__(self, items):
+        self.items = items
+
+    def get_paginator(self, name):
+        assert name == "scan"
+        return FakePaginator(lambda: [{"Items": self.items}])
+
+
+class FakeS3:
+    """
+    Keeps object bodies by key and lists them with the MD5 ETag S3 gives
+    single part uploads.
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.puts = []
+        self.delete_calls = []
+
+    def get_paginator(self, name):
+        assert name == "list_objects_v2"
+        return FakePaginator(
+            lambda: [
+                {
+                    "Contents": [
+                        {"Key": key, "ETag": f'"{hashlib.md5(body).hexdigest()}"'}
+                        for key, body in sorted(self.objects.items())
+                    ]
+                }
+            ]
+        )
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body
+        self.puts.append(Key)
+
+    def delete_objects(self, Bucket, Delete):
+        self.delete_calls.append([obj["Key"] for obj in Delete["Objects"]])
+        for obj in Delete["Objects"]:
+            self.objects.pop(obj["Key"], None)
+
+
+def item(event_id: int, start_date: str, title: str) -> dict:
+    return {
+        "event_id": {"N": str(event_id)},
+        "start_date": {"S": start_date},
+        "start_time": {"S": "10:00"},
+        "title": {"S": title},
+        "event_description": {"S": f"About {title}"},
+        "content_hash": {"S": "h"},
+    }
+
+
+@pytest.fixture
+def clients(monkeypatch):
+    s3 = FakeS3()
+    dynamodb = FakeDynamoDB(
+        [item(2, "2025-12-12", "Lecture"), item(1, "2025-12-11", "Concert")]
+    )
+    monkeypatch.setitem(aws_clients._clients, "s3", s3)
+    monkeypatch.setitem(aws_clients._clients, "dynamodb", dynamodb)
+    monkeypatch.setenv("SNAPSHOTS_BUCKET_NAME", "snapshots")
+    monkeypatch.setenv("TABLE_NAME", "events")
+    return s3, dynamodb
+
+
+def test_snapshot_body_is_deterministic():
+    # Attribute order differs between scans, the bytes must not
+    first = snapshot_body({"title": "Concert", "event_id": 1})
+    second = snapshot_body({"event_id": 1, "title": "Concert"})
+
+    assert first == second
+    # No timestamp in the gzip header
+    assert first[4:8] == b"\x00\x00\x00\x00"
+    assert json.loads(gzip.decompress(first)) == {"event_id": 1, "title": "Concert"}
+
+
+def test_handler_publishes_list_day_and_detail_snapshots(clients):
+    s3, _ = clients
+
+    summary = handler({}, None)
+
+    assert sorted(s3.objects) == [
+        "snapshots/days/2025-12-11.json",
+        "snapshots/days/2025-12-12.json",
+        "snapshots/events.json",
+        "snapshots/events/1.json",
+        "snapshots/events/2.json",
+    ]
+    listing = json.loads(gzip.decompress(s3.objects["snapshots/events.json"]))
+    assert [event["event_id"] for event in listing] == [1, 2]
+    assert "event_description" not in listing[0]
+    detail = json.loads(gzip.decompress(s3.objects["snapshots/events/1.json"]))
+    assert detail["event_description"] == "About Concert"
+    assert "content_hash" not in detail
+    assert summary["written"] == 5
+
+
+def test_handler_skips_snapshots_whose_etag_matches(clients):
+    s3, dynamodb = clients
+    handler({}, None)
+    s3.puts.clear()
+
+    dynamodb.items[0] = item(2, "2025-12-12", "Lecture (moved)")
+    summary = handler({}, None)
+
+    # Only the snapshots holding event 2 changed
+    assert sorted(s3.puts) == [
+        "snapshots/days/2025-12-12.json",
+        "snapshots/events.json",
+        "snapshots/events/2.json",
+    ]
+    assert summary["unchanged"] == 2
+
+
+def test_handler_deletes_stale_snapshots_in_batches(clients, monkeypatch):
+    s3, _ = clients
+    monkeypatch.setattr(publish_event_snapshots_fn, "DELETE_BATCH_SIZE", 2)
+    for event_id in range(100, 105):
+        s3.objects[f"snapshots/events/{event_id}.json"] = b"old"
+
+    summary = handler({}, None)
+
+    assert [len(keys) for keys in s3.delete_calls] == [2, 2, 1]
+    assert summary["deleted"] == 5
+    assert not any(key.startswith("snapshots/events/10") for key in s3.objects)
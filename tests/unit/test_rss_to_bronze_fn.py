@@ -0,0 +1,222 @@
+import gzip
+import io
+import json
+import random
+from email.message import Message
+from types import SimpleNamespace
+from urllib import error
+
+import pytest
+
+import aws_clients
+import rss_to_bronze_fn
+from rss_to_bronze_fn import FEED_STATE_KEY, handler
+
+FEED = b"<rss><channel><item><title>Event</title></item></channel></rss>"
+
+
+class NoSuchKey(Exception):
+    pass
+
+
+class FakeS3:
+    """
+    Keeps objects in a dict and multipart uploads until they are completed
+    or aborted.
+    """
+
+    exceptions = SimpleNamespace(NoSuchKey=NoSuchKey)
+
+    def __init__(self):
+        self.objects = {}
+        self.uploads = {}
+        self.completed = []
+        self.aborted = []
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise NoSuchKey(Key)
+        return {"Body": io.BytesIO(self.objects[Key]["Body"])}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = {"Body": Body, **kwargs}
+
+    def create_multipart_upload(self, Bucket, Key, **kwargs):
+        upload_id = f"upload-{len(self.uploads) + 1}"
+        self.uploads[upload_id] = {"Key": Key, "parts": {}, "args": kwargs}
+        return {"UploadId": upload_id}
+
+    def upload_part(self, Bucket, Key, UploadId, PartNumber, Body):
+        self.uploads[UploadId]["parts"][PartNumber] = Body
+        return {"ETag": f"etag-{PartNumber}"}
+
+    def complete_multipart_upload(self, Bucket, Key, UploadId, MultipartUpload):
+        upload = self.uploads.pop(UploadId)
+        body = b"".join(
+            upload["parts"][part["PartNumber"]] for part in MultipartUpload["Parts"]
+        )
+        self.objects[Key] = {"Body": body, **upload["args"]}
+        self.completed.append(len(MultipartUpload["Parts"]))
+
+    def abort_multipart_upload(self, Bucket, Key, UploadId):
+        del self.uploads[UploadId]
+        self.aborted.append(UploadId)
+
+    def feed_keys(self):
+        return sorted(key for key in self.objects if key.startswith("new/"))
+
+    def state(self):
+        return json.loads(self.objects[FEED_STATE_KEY]["Body"])
+
+
+class FakeResponse(io.BytesIO):
+    def __init__(self, body: bytes, headers: dict):
+        super().__init__(body)
+        self.headers = headers
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    fake = FakeS3()
+    monkeypatch.setitem(aws_clients._clients, "s3", fake)
+    monkeypatch.setenv("RSS_FEED_URL", "https://example.edu/events.xml")
+    monkeypatch.setenv("BRONZE_BUCKET_NAME", "bronze")
+    return fake
+
+
+def serve(monkeypatch, body: bytes = FEED, status: int = 200, headers=None):
+    """
+    Answers urlopen with ```body```, or raises the HTTPError urllib raises for
+    a 304. Returns the requests made.
+    """
+
+    requests = []
+
+    def urlopen(rss_request, timeout):
+        requests.append(rss_request)
+        if status == 304:
+            raise error.HTTPError(
+                rss_request.full_url, 304, "Not Modified", Message(), None
+            )
+        return FakeResponse(body, headers or {})
+
+    monkeypatch.setattr(rss_to_bronze_fn.request, "urlopen", urlopen)
+    return requests
+
+
+def test_not_modified_feed_is_skipped(s3, monkeypatch):
+    s3.put_object(
+        Bucket="bronze",
+        Key=FEED_STATE_KEY,
+        Body=json.dumps(
+            {"etag": '"v1"', "last_modified": "Thu, 11 Dec 2025 06:00:00 GMT"}
+        ).encode("utf-8"),
+    )
+    requests = serve(monkeypatch, status=304)
+
+    response = handler({}, None)
+
+    assert response["skipped"] is True
+    assert requests[0].get_header("If-none-match") == '"v1"'
+    assert requests[0].get_header("If-modified-since") == (
+        "Thu, 11 Dec 2025 06:00:00 GMT"
+    )
+    assert s3.feed_keys() == []
+    # Rewritten so the lifecycle rule never archives it
+    assert s3.state()["etag"] == '"v1"'
+    assert "checked_at" in s3.state()
+
+
+def test_changed_feed_is_stored_and_recorded(s3, monkeypatch):
+    serve(
+        monkeypatch,
+        headers={"ETag": '"v2"', "Last-Modified": "Fri, 12 Dec 2025 06:00:00 GMT"},
+    )
+
+    response = handler({}, None)
+
+    assert response["skipped"] is False
+    assert len(s3.feed_keys()) == 1
+    state = s3.state()
+    assert state["etag"] == '"v2"'
+    assert state["last_modified"] == "Fri, 12 Dec 2025 06:00:00 GMT"
+    assert state["sha256"] == json.loads(response["body"])["sha256"]
+
+
+def test_unchanged_feed_is_skipped_by_digest(s3, monkeypatch):
+    # The server ignores the validators, so the content has to be compared
+    serve(monkeypatch, headers={"ETag": '"v1"'})
+    handler({}, None)
+    first_keys = s3.feed_keys()
+
+    serve(monkeypatch, headers={"ETag": '"v2"'})
+    response = handler({}, None)
+
+    assert response["skipped"] is True
+    assert s3.feed_keys() == first_keys
+    # The new validators are kept for the next conditional GET
+    assert s3.state()["etag"] == '"v2"'
+
+
+def large_feed(size: int) -> bytes:
+    # Random bytes barely compress, so the gzip stream spans several parts
+    return random.Random(size).randbytes(size)
+
+
+def test_large_feed_is_uploaded_gzip_in_parts(s3, monkeypatch):
+    monkeypatch.setattr(rss_to_bronze_fn, "MIN_PART_SIZE", 4096)
+    monkeypatch.setattr(rss_to_bronze_fn, "READ_CHUNK_SIZE", 1024)
+    feed = large_feed(20_000)
+    serve(monkeypatch, body=feed)
+
+    response = handler({}, None)
+
+    (key,) = s3.feed_keys()
+    assert key.endswith(".xml.gz")
+    stored = s3.objects[key]
+    assert stored["ContentEncoding"] == "gzip"
+    assert gzip.decompress(stored["Body"]) == feed
+    body = json.loads(response["body"])
+    assert body["content_size"] == len(feed)
+    assert body["compressed_size"] == len(stored["Body"])
+    assert len(s3.completed) == 1 and s3.completed[0] > 1
+
+
+def test_small_feed_is_uploaded_with_one_put(s3, monkeypatch):
+    serve(monkeypatch)
+
+    handler({}, None)
+
+    (key,) = s3.feed_keys()
+    assert gzip.decompress(s3.objects[key]["Body"]) == FEED
+    assert s3.completed == [] and s3.aborted == []
+
+
+def test_unchanged_large_feed_aborts_its_upload(s3, monkeypatch):
+    monkeypatch.setattr(rss_to_bronze_fn, "MIN_PART_SIZE", 4096)
+    monkeypatch.setattr(rss_to_bronze_fn, "READ_CHUNK_SIZE", 1024)
+    feed = large_feed(20_000)
+    serve(monkeypatch, body=feed)
+    handler({}, None)
+    first_keys = s3.feed_keys()
+
+    serve(monkeypatch, body=feed)
+    response = handler({}, None)
+
+    # Parts were already sent when the digest matched, none of them stay
+    assert response["skipped"] is True
+    assert s3.feed_keys() == first_keys
+    assert len(s3.aborted) == 1
+    assert s3.uploads == {}
+
+
+def test_uncompressed_feed_is_stored_as_is(s3, monkeypatch):
+    monkeypatch.setenv("BRONZE_COMPRESSION", "none")
+    serve(monkeypatch)
+
+    handler({}, None)
+
+    (key,) = s3.feed_keys()
+    assert key.endswith(".xml")
+    assert s3.objects[key]["Body"] == FEED
+    assert "ContentEncoding" not in s3.objects[key]
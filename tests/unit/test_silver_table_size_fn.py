@@ -0,0 +1,73 @@
+import io
+import json
+
+import aws_clients
+from silver_table_size_fn import handler
+
+
+class EntityNotFoundException(Exception):
+    pass
+
+
+class FakeGlue:
+    class exceptions:
+        EntityNotFoundException = EntityNotFoundException
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    def get_table(self, DatabaseName, Name):
+        if (DatabaseName, Name) not in self.tables:
+            raise EntityNotFoundException(Name)
+        return {"Table": self.tables[(DatabaseName, Name)]}
+
+
+class FakeS3:
+    def __init__(self, objects):
+        self.objects = objects
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+
+def test_handler_reads_the_current_snapshot_summary(monkeypatch):
+    metadata_key = "uc_events/metadata/00002-abc.metadata.json"
+    metadata = {
+        "current-snapshot-id": 2,
+        "snapshots": [
+            {
+                "snapshot-id": 1,
+                "summary": {"total-records": "10", "total-files-size": "100"},
+            },
+            {
+                "snapshot-id": 2,
+                "summary": {"total-records": "12", "total-files-size": "150"},
+            },
+        ],
+    }
+    glue = FakeGlue(
+        {
+            ("silver", "uc_events"): {
+                "Parameters": {"metadata_location": f"s3://silver/{metadata_key}"}
+            }
+        }
+    )
+    s3 = FakeS3({("silver", metadata_key): json.dumps(metadata).encode("utf-8")})
+    monkeypatch.setitem(aws_clients._clients, "glue", glue)
+    monkeypatch.setitem(aws_clients._clients, "s3", s3)
+
+    assert handler({"SILVER_DATABASE": "silver"}, None) == {
+        "exists": True,
+        "total_records": 12,
+        "total_bytes": 150,
+    }
+
+
+def test_handler_reports_a_missing_table_as_empty(monkeypatch):
+    monkeypatch.setitem(aws_clients._clients, "glue", FakeGlue({}))
+
+    assert handler({"SILVER_DATABASE": "silver"}, None) == {
+        "exists": False,
+        "total_records": 0,
+        "total_bytes": 0,
+    }
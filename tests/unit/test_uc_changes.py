@@ -0,0 +1,65 @@
+import io
+import json
+from types import SimpleNamespace
+
+from uc_changes import (
+    LATEST_CHANGESET_KEY,
+    changeset_base_snapshot_id,
+    copy_to_processed_bucket,
+    write_latest_changeset,
+)
+
+
+class NoSuchKey(Exception):
+    pass
+
+
+class FakeS3:
+    exceptions = SimpleNamespace(NoSuchKey=NoSuchKey)
+
+    def __init__(self):
+        self.objects = {}
+
+    def get_object(self, Bucket, Key):
+        if (Bucket, Key) not in self.objects:
+            raise NoSuchKey(Key)
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[(Bucket, Key)] = Body
+
+    def copy_object(self, Bucket, Key, CopySource):
+        self.objects[(Bucket, Key)] = self.objects[
+            (CopySource["Bucket"], CopySource["Key"])
+        ]
+
+    def delete_object(self, Bucket, Key):
+        del self.objects[(Bucket, Key)]
+
+
+def test_changeset_base_snapshot_id_follows_the_latest_changeset():
+    s3 = FakeS3()
+
+    # No changeset yet, diff from what the run wrote onto
+    assert changeset_base_snapshot_id(s3, "silver", lambda _: True, 7) == 7
+
+    write_latest_changeset(
+        s3, "silver", "20251212T060000Z", 7, 9, {"insert": 1, "update": 0, "delete": 0}
+    )
+    latest = json.loads(s3.objects[("silver", LATEST_CHANGESET_KEY)])
+    assert latest["path"] == "s3://silver/_changes/20251212T060000Z/"
+    assert latest["snapshot_id"] == 9
+
+    assert changeset_base_snapshot_id(s3, "silver", lambda _: True, 10) == 9
+    # Snapshot 9 was expired since
+    assert changeset_base_snapshot_id(s3, "silver", lambda _: False, 10) == 10
+
+
+def test_copy_to_processed_bucket_moves_the_file():
+    s3 = FakeS3()
+    s3.objects[("bronze", "new/events_20251212_060000.xml")] = b"<rss/>"
+
+    dest_key = copy_to_processed_bucket(s3, "bronze", "new/events_20251212_060000.xml")
+
+    assert dest_key == "processed/events_20251212_060000.xml"
+    assert s3.objects == {("bronze", dest_key): b"<rss/>"}
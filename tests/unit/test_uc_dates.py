@@ -0,0 +1,109 @@
+import random
+import re
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from uc_dates import date_and_time
+
+CORPUS_SIZE = 50_000
+
+
+def reference_date_and_time(value: str):
+    """
+    The extraction parse_entry used before uc_dates.
+    """
+
+    date_match = re.search(
+        r"(\d{1,2}) (Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) (\d{4})", value
+    )
+    time_match = re.search(r"(\d{2}:\d{2}:\d{2})", value)
+    return (
+        (
+            datetime.strptime(date_match.group(0), "%d %b %Y").date()
+            if date_match
+            else None
+        ),
+        time_match.group(0) if time_match else None,
+    )
+
+
+def outcome(extract, value: str):
+    try:
+        return extract(value)
+    except ValueError:
+        return ValueError
+
+
+def synthetic_value(rng: random.Random) -> str:
+    moment = datetime(1900, 1, 1, tzinfo=timezone.utc) + timedelta(
+        seconds=rng.randrange(200 * 365 * 24 * 3600)
+    )
+    value = format_datetime(moment, usegmt=True)
+    kind = rng.randrange(12)
+    if kind == 0:
+        # No weekday
+        value = value[5:]
+    elif kind == 1:
+        # Day without leading zero
+        value = re.sub(r" 0(\d) ", r" \1 ", value)
+    elif kind == 2:
+        # Time first
+        value = f"{moment:%H:%M:%S} {moment:%d %b %Y}"
+    elif kind == 3:
+        value = f"{moment:%d %b %Y}"
+    elif kind == 4:
+        value = moment.isoformat()
+    elif kind == 5:
+        # Days the month doesn't have
+        day = rng.choice(["0", "00", "30", "31", "32", "99"])
+        value = f"{day} Feb {moment:%Y %H:%M:%S}"
+    elif kind == 6:
+        value = value.replace(" ", "  ", 1)
+    elif kind == 7:
+        value = value.replace(moment.strftime("%b"), moment.strftime("%b").upper())
+    elif kind == 8:
+        # Three digit day, five digit year, three digit hour
+        value = rng.choice(
+            [
+                f"1{value[5:]}",
+                value.replace(f" {moment:%Y} ", f" {moment:%Y}1 "),
+                value.replace(" ", " 1", 4)[:40],
+            ]
+        )
+    elif kind == 9:
+        value = f"starts {value} and runs late"
+    elif kind == 10:
+        value = rng.choice(["", "None", "TBA", "Thu, 11 Dec", "22:00"])
+    return value
+
+
+def test_date_and_time_matches_reference_on_synthetic_corpus():
+    rng = random.Random(0)
+    values = [synthetic_value(rng) for _ in range(CORPUS_SIZE)]
+    # Recurring events repeat their strings, the cache must not change results
+    values += rng.sample(values, CORPUS_SIZE // 10)
+
+    for value in values:
+        assert outcome(date_and_time, value) == outcome(
+            reference_date_and_time, value
+        ), value
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "Thu, 11 Dec 2025 22:00:00 GMT",
+        "Fri, 12 Dec 2025 00:00:00 GMT",
+        "Sun, 29 Feb 2024 09:30:00 GMT",
+        "Mon, 29 Feb 2025 09:30:00 GMT",
+        "Thu, 11 Dec 2025",
+        "11 Dec 2025 22:00:00",
+        "Thu, 111 Dec 2025 22:00:00 GMT",
+        "Thu, 11 Dec 20251 22:00:00 GMT",
+        "Thu, 11 Dec 2025 122:00:00 GMT",
+    ],
+)
+def test_date_and_time_matches_reference_on_edge_cases(value):
+    assert outcome(date_and_time, value) == outcome(reference_date_and_time, value)
@@ -0,0 +1,52 @@
+import glob
+import os
+import unicodedata
+
+import feedparser
+import pytest
+from bs4 import BeautifulSoup
+
+from uc_html import description_text
+
+FIXTURES = glob.glob(
+    os.path.join(os.path.dirname(__file__), os.pardir, "fixtures", "events_*.xml")
+)
+
+
+def beautifulsoup_description(html: str) -> str:
+    """
+    The extraction bronze_to_silver used before uc_html.
+    """
+
+    desc = BeautifulSoup(html, "html.parser").select_one(".p-description")
+    if desc is None:
+        return ""
+    return unicodedata.normalize("NFKC", desc.get_text(separator=" ", strip=True))
+
+
+@pytest.mark.parametrize("fixture", FIXTURES, ids=os.path.basename)
+def test_description_text_matches_beautifulsoup_on_fixtures(fixture):
+    with open(fixture, encoding="utf-8") as f:
+        feed = feedparser.parse(f.read())
+
+    assert feed.entries
+    for entry in feed.entries:
+        html = str(entry.get("description", ""))
+        assert description_text(html) == beautifulsoup_description(html)
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        '<div class="p-description description"><p>One&nbsp;</p><p>Two &amp; three</p></div>',
+        '<div class="p-description"><div>nested</div> tail <br>after<br/>break</div>outside',
+        '<div class="x p-description"><script>var a = "<b>";</script><!-- c -->kept</div>',
+        '<section><span class="p-description">closed by</section> ancestor</span>',
+        '<div class="p-description">unclosed <b>text &copy &#169; &bogus;',
+        '<img class="p-description"><div class="p-description">second</div>',
+        '<div class="p-name">no description</div>',
+        '<div class="p-description">ﬁ Ｆｕｌｌｗｉｄｔｈ</div>',
+    ],
+)
+def test_description_text_matches_beautifulsoup_on_edge_cases(html):
+    assert description_text(html) == beautifulsoup_description(html)
@@ -0,0 +1,106 @@
+import gzip
+import io
+import os
+
+import pytest
+
+# pyarrow ships with the Glue jobs, not with the CDK app
+pq = pytest.importorskip("pyarrow.parquet")
+pa = pytest.importorskip("pyarrow")
+
+from uc_local import bronze_dir_files, main, open_bronze_dir, transform
+from uc_transform import iter_feed_items
+
+FIXTURE = os.path.join(
+    os.path.dirname(__file__), os.pardir, "fixtures", "events_20251211_060736.xml"
+)
+
+
+def read_fixture() -> str:
+    with open(FIXTURE, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_transform_keeps_newest_row_of_active_events(tmp_path):
+    feed = read_fixture()
+    # The newer file renames one event and drops the other
+    first_item_end = feed.index("</item>") + len("</item>")
+    second_item_end = feed.index("</item>", first_item_end) + len("</item>")
+    newer_feed = (
+        feed[:first_item_end].replace(
+            "<title>BCMS Aero Sub-Team Meeting</title>",
+            "<title>BCMS Aero Sub-Team Meeting (moved)</title>",
+        )
+        + feed[second_item_end:]
+    )
+
+    (tmp_path / "events_20251211_060736.xml").write_text(feed, encoding="utf-8")
+    (tmp_path / "events_20251212_060736.xml.gz").write_bytes(
+        gzip.compress(newer_feed.encode("utf-8"))
+    )
+    (tmp_path / "notes.txt").write_text("not a feed")
+
+    file_names = bronze_dir_files(str(tmp_path))
+    assert file_names == [
+        "events_20251211_060736.xml",
+        "events_20251212_060736.xml.gz",
+    ]
+
+    rows = transform(
+        open_bronze_dir(str(tmp_path), file_names),
+        load_date="2025-12-12T00:00:00+00:00",
+    ).to_pylist()
+    assert [(row["event_id"], row["title"], row["record_source"]) for row in rows] == [
+        (
+            11654144,
+            "BCMS Aero Sub-Team Meeting (moved)",
+            "events_20251212_060736.xml.gz",
+        )
+    ]
+    assert len(rows[0]["content_hash"]) == 64
+
+
+def test_transform_writes_item_fingerprint_like_glue():
+    feed = read_fixture()
+    table = transform(
+        [("events_20251211_060736.xml", io.BytesIO(feed.encode("utf-8")))]
+    )
+
+    # Silver rows without it would all be parsed again by the next Glue run
+    assert table.column_names[-2:] == ["item_fingerprint", "content_hash"]
+    fingerprints = table.column("item_fingerprint").to_pylist()
+    items = list(iter_feed_items(io.BytesIO(feed.encode("utf-8"))))
+    assert sorted(fingerprints) == sorted(item.fingerprint for item in items)
+
+
+def test_transform_takes_unchanged_items_from_silver():
+    feed = read_fixture().encode("utf-8")
+    silver = transform([("events_20251211_060736.xml", io.BytesIO(feed))])
+    # Marks the silver copy of one event so it shows whether the item was parsed
+    titles = silver.column("title").to_pylist()
+    titles[0] = "From silver"
+    silver = silver.set_column(
+        silver.column_names.index("title"), "title", pa.array(titles)
+    )
+
+    table = transform([("events_20251212_060736.xml", io.BytesIO(feed))], silver=silver)
+
+    assert table.column("title").to_pylist() == titles
+    assert set(table.column("record_source").to_pylist()) == {
+        "events_20251212_060736.xml"
+    }
+
+
+def test_main_writes_parquet(tmp_path):
+    input_dir = tmp_path / "bronze"
+    input_dir.mkdir()
+    (input_dir / "events_20251211_060736.xml").write_text(
+        read_fixture(), encoding="utf-8"
+    )
+    output = tmp_path / "silver.parquet"
+
+    main(["--input-dir", str(input_dir), "--output", str(output)])
+
+    table = pq.read_table(output)
+    assert table.num_rows == 2
+    assert table.column_names[-1] == "content_hash"
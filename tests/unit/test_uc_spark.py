@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import pytest
+
+from uc_spark import (
+    SILVER_EVENTS_TABLE,
+    TuningProfile,
+    drop_legacy_silver_table,
+    tuning_conf,
+)
+
+
+class EntityNotFoundException(Exception):
+    pass
+
+
+class FakeGlue:
+    exceptions = SimpleNamespace(EntityNotFoundException=EntityNotFoundException)
+
+    def __init__(self, table=None):
+        self.table = table
+        self.deleted = []
+
+    def get_table(self, DatabaseName, Name):
+        if self.table is None:
+            raise EntityNotFoundException(Name)
+        return {"Table": self.table}
+
+    def delete_table(self, DatabaseName, Name):
+        self.deleted.append((DatabaseName, Name))
+
+
+@pytest.mark.parametrize(
+    "row_count, partitions",
+    [(0, 2), (1_000, 2), (120_000, 3), (500_000, 10), (50_000_000, 200)],
+)
+def test_shuffle_partitions_are_sized_to_input(row_count, partitions):
+    assert TuningProfile().shuffle_partitions(row_count) == partitions
+
+
+def test_profile_overrides_from_json():
+    profile = TuningProfile.from_json(
+        '{"rows_per_partition": 1000, "output_partitions": 1}'
+    )
+
+    assert profile.shuffle_partitions(10_500) == 11
+    assert profile.output_partitions == 1
+    assert TuningProfile.from_json(None) == TuningProfile()
+    with pytest.raises(TypeError):
+        TuningProfile.from_json('{"shuffle_partition": 4}')
+
+
+def test_tuning_conf_enables_aqe_and_broadcasts():
+    conf = dict(tuning_conf(TuningProfile(broadcast_threshold="16m")))
+
+    assert conf["spark.sql.adaptive.enabled"] == "true"
+    assert conf["spark.sql.autoBroadcastJoinThreshold"] == "16m"
+    assert conf["spark.sql.shuffle.partitions"] == "2"
+
+
+def test_crawler_table_is_dropped_before_iceberg_creates_silver():
+    glue = FakeGlue(
+        {"Name": SILVER_EVENTS_TABLE, "Parameters": {"classification": "parquet"}}
+    )
+
+    assert drop_legacy_silver_table(glue, "silver-db")
+    assert glue.deleted == [("silver-db", SILVER_EVENTS_TABLE)]
+
+
+@pytest.mark.parametrize(
+    "table",
+    [None, {"Name": SILVER_EVENTS_TABLE, "Parameters": {"table_type": "ICEBERG"}}],
+)
+def test_iceberg_or_missing_silver_table_is_kept(table):
+    glue = FakeGlue(table)
+
+    assert not drop_legacy_silver_table(glue, "silver-db")
+    assert glue.deleted == []
@@ -0,0 +1,97 @@
+import gzip
+import io
+import os
+import pickle
+
+import feedparser
+
+from uc_transform import iter_feed_entries, iter_feed_items, open_bronze, parse_entry
+
+FIXTURE = os.path.join(
+    os.path.dirname(__file__), os.pardir, "fixtures", "events_20251211_060736.xml"
+)
+
+
+def read_fixture() -> bytes:
+    with open(FIXTURE, "rb") as f:
+        return f.read()
+
+
+def iter_feed_events(stream):
+    return (item.event for item in iter_feed_items(stream))
+
+
+def feedparser_events(feed: bytes):
+    """
+    The parsing bronze_to_silver used before iterparse, kept as the reference.
+    """
+
+    return [parse_entry(entry) for entry in feedparser.parse(feed).entries]
+
+
+def test_iter_feed_events_matches_feedparser():
+    feed = read_fixture()
+
+    events = list(iter_feed_events(io.BytesIO(feed)))
+
+    assert events == feedparser_events(feed)
+    assert [event.event_id for event in events] == [11654144, 11653846]
+
+
+def test_iter_feed_events_reads_gzip_bronze_objects():
+    feed = read_fixture()
+    body = io.BytesIO(gzip.compress(feed))
+
+    # Bronze objects keep their .xml name, only the bytes say they are gzip
+    stream = open_bronze(body)
+
+    assert list(iter_feed_events(stream)) == list(iter_feed_events(io.BytesIO(feed)))
+
+
+def test_open_bronze_passes_plain_feeds_through():
+    feed = read_fixture()
+
+    assert open_bronze(io.BytesIO(feed)).read() == feed
+    assert open_bronze(io.BytesIO(b"")).read() == b""
+
+
+def test_feed_entries_parse_after_pickling():
+    feed = read_fixture()
+
+    # What the Glue job sends to the executors and what they send back
+    entries = [entry for _, entry in iter_feed_entries(io.BytesIO(feed))]
+    sent = pickle.loads(pickle.dumps(entries))
+    events = pickle.loads(pickle.dumps([parse_entry(entry) for entry in sent]))
+
+    assert events == list(iter_feed_events(io.BytesIO(feed)))
+
+
+def test_iter_feed_items_skips_known_fingerprints():
+    feed = read_fixture()
+    first, second = iter_feed_items(io.BytesIO(feed))
+
+    items = list(
+        iter_feed_items(io.BytesIO(feed), known_fingerprints={first.fingerprint})
+    )
+
+    assert items == [(11654144, first.fingerprint, None), second]
+
+
+def test_item_fingerprint_ignores_fields_the_event_does_not_use():
+    feed = read_fixture()
+    republished = feed.replace(
+        b"<pubDate>Thu, 11 Dec 2025 06:07:35 GMT</pubDate>",
+        b"<pubDate>Fri, 12 Dec 2025 06:07:35 GMT</pubDate>",
+    )
+    renamed = feed.replace(
+        b"<title>BCMS Aero Sub-Team Meeting</title>",
+        b"<title>BCMS Aero Sub-Team Meeting (moved)</title>",
+    )
+    assert republished != feed and renamed != feed
+
+    def fingerprints(xml: bytes):
+        return [item.fingerprint for item in iter_feed_items(io.BytesIO(xml))]
+
+    assert fingerprints(republished) == fingerprints(feed)
+    assert fingerprints(renamed)[0] != fingerprints(feed)[0]
+    assert fingerprints(renamed)[1] == fingerprints(feed)[1]